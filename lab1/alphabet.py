@@ -0,0 +1,54 @@
+import re
+from functools import lru_cache
+from itertools import accumulate
+
+RUSSIAN_ALPHABET = 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'
+ENGLISH_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+class Alphabet:
+    def __init__(self, letters: str):
+        self.letters = letters
+        self.size = len(letters)
+        self.upper = tuple(letters)
+        self.lower = tuple(char.lower() for char in letters)
+        self._indices: dict[str, int] = {}
+
+        for index, char in enumerate(self.upper):
+            self._indices.setdefault(char, index)
+        for index, char in enumerate(self.lower):
+            self._indices.setdefault(char, index)
+
+    def index(self, char: str) -> int:
+        index = self._indices.get(char)
+        if index is None:
+            char_upper = char.upper()
+            index = self.letters.index(char_upper) if char_upper in self.letters else -1
+            self._indices[char] = index
+        return index
+
+    def char(self, index: int, is_upper: bool) -> str:
+        return self.upper[index] if is_upper else self.lower[index]
+
+    def count(self, text: str) -> int:
+        return sum(text.count(char) for char in set(text) if char in self)
+
+    def present(self, text: str) -> str:
+        return ''.join(char for char in set(text) if char in self)
+
+    def split(self, text: str, present: str) -> list[str]:
+        # Нечётные элементы - непрерывные участки букв алфавита
+        return re.split('([' + re.escape(present) + ']+)', text)
+
+    def merge(self, parts: list[str], stream: str) -> str:
+        bounds = list(accumulate(map(len, parts[1::2]), initial=0))
+        parts[1::2] = map(stream.__getitem__, map(slice, bounds, bounds[1:]))
+        return ''.join(parts)
+
+    def __contains__(self, char: str) -> bool:
+        return self.index(char) >= 0
+
+
+@lru_cache(maxsize=None)
+def compile_alphabet(letters: str) -> Alphabet:
+    return Alphabet(letters)
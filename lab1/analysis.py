@@ -0,0 +1,194 @@
+import argparse
+import math
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from alphabet import RUSSIAN_ALPHABET, ENGLISH_ALPHABET, compile_alphabet
+
+LETTER_FREQUENCIES = {
+    RUSSIAN_ALPHABET: (
+        8.01, 1.59, 4.54, 1.70, 2.98, 8.45, 0.04, 0.94, 1.65, 7.35, 1.21,
+        3.49, 4.40, 3.21, 6.70, 10.97, 2.81, 4.73, 5.47, 6.26, 2.62, 0.26,
+        0.97, 0.48, 1.44, 0.73, 0.36, 0.04, 1.90, 1.74, 0.32, 0.64, 2.01,
+    ),
+    ENGLISH_ALPHABET: (
+        8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966,
+        0.153, 0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987,
+        6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+    ),
+}
+
+
+class KeyCandidate(NamedTuple):
+    length: int
+    key: str
+    coincidence: float
+    chi_squared: float
+    kasiski_votes: int
+
+
+def letter_stream(text: str, alphabet: str) -> str:
+    compiled = compile_alphabet(alphabet)
+    letters = compiled.present(text)
+    if not letters:
+        return ''
+
+    canonical = {ord(char): compiled.upper[compiled.index(char)] for char in letters}
+    return ''.join(compiled.split(text, letters)[1::2]).translate(canonical)
+
+
+def letter_counts(stream: str, alphabet: str) -> list[int]:
+    return [stream.count(char) for char in alphabet]
+
+
+def index_of_coincidence(stream: str, alphabet: str) -> float:
+    total = len(stream)
+    if total < 2:
+        return 0.0
+    counts = letter_counts(stream, alphabet)
+    return sum(count * (count - 1) for count in counts) / (total * (total - 1))
+
+
+def expected_coincidence(alphabet: str) -> float:
+    frequencies = LETTER_FREQUENCIES[alphabet]
+    total = sum(frequencies)
+    return sum((frequency / total) ** 2 for frequency in frequencies)
+
+
+def kasiski(stream: str, max_length: int, ngram: int = 3) -> Counter:
+    # Индекс n-грамм: для каждой n-граммы хранится позиция её последнего вхождения
+    last_seen: dict[str, int] = {}
+    distances: Counter = Counter()
+    for pos in range(len(stream) - ngram + 1):
+        gram = stream[pos:pos + ngram]
+        previous = last_seen.get(gram)
+        if previous is not None:
+            distances[pos - previous] += 1
+        last_seen[gram] = pos
+
+    votes: Counter = Counter()
+    for distance, count in distances.items():
+        for length in range(2, min(max_length, distance) + 1):
+            if distance % length == 0:
+                votes[length] += count
+    return votes
+
+
+def solve_column(column: str, alphabet: str, frequencies: tuple[float, ...]) -> tuple[int, float]:
+    size = len(alphabet)
+    total = len(column)
+    counts = letter_counts(column, alphabet)
+    scale = total / sum(frequencies)
+    expected = [frequency * scale for frequency in frequencies]
+
+    best_shift, best_score = 0, math.inf
+    for shift in range(size):
+        rotated = counts[shift:] + counts[:shift]
+        score = sum((observed - exp) ** 2 / exp for observed, exp in zip(rotated, expected))
+        if score < best_score:
+            best_shift, best_score = shift, score
+    return best_shift, best_score
+
+
+_worker_stream = ''
+
+
+def _init_worker(stream: str) -> None:
+    global _worker_stream
+    _worker_stream = stream
+
+
+def _solve_length(length: int, alphabet: str) -> tuple[int, str, float, float]:
+    stream = _worker_stream
+    frequencies = LETTER_FREQUENCIES[alphabet]
+    key = []
+    chi_total = 0.0
+    coincidence = 0.0
+    for offset in range(length):
+        column = stream[offset::length]
+        shift, score = solve_column(column, alphabet, frequencies)
+        key.append(alphabet[shift])
+        chi_total += score / max(len(column), 1)
+        coincidence += index_of_coincidence(column, alphabet)
+    return length, ''.join(key), coincidence / length, chi_total / length
+
+
+def _shortest_period(key: str) -> str:
+    for length in range(1, len(key)):
+        if len(key) % length == 0 and key[:length] * (len(key) // length) == key:
+            return key[:length]
+    return key
+
+
+def analyze(ciphertext: str, alphabet: str, max_length: int = 20, workers: int | None = None) -> list[KeyCandidate]:
+    if alphabet not in LETTER_FREQUENCIES:
+        raise ValueError("Нет таблицы частот для выбранного алфавита")
+
+    stream = letter_stream(ciphertext, alphabet)
+    if len(stream) < 2:
+        raise ValueError("Недостаточно букв для анализа")
+
+    max_length = max(1, min(max_length, len(stream) // 2 or 1))
+    votes = kasiski(stream, max_length)
+    lengths = range(1, max_length + 1)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stream,)) as pool:
+        results = list(pool.map(_solve_length, lengths, [alphabet] * len(lengths)))
+
+    candidates = [
+        KeyCandidate(length, key, coincidence, chi_squared, votes.get(length, 0))
+        for length, key, coincidence, chi_squared in results
+    ]
+    candidates.sort(key=lambda candidate: (candidate.chi_squared, candidate.length))
+    return candidates
+
+
+def choose_key(candidates: list[KeyCandidate], alphabet: str) -> str:
+    # Длины, у которых средний индекс совпадений столбцов ближе к случайному, чем к языковому, отбрасываются
+    threshold = (expected_coincidence(alphabet) + 1 / len(alphabet)) / 2
+    plausible = [candidate for candidate in candidates if candidate.coincidence >= threshold] or candidates
+
+    # Кратные длины ключа дают почти такой же хи-квадрат; среди близких у истинной длины больше всего
+    # голосов Касиски (расстояние, кратное 2L, кратно и L), при равенстве берётся самая короткая
+    best = min(candidate.chi_squared for candidate in plausible)
+    close = [candidate for candidate in plausible if candidate.chi_squared <= best * 1.1]
+    chosen = max(close, key=lambda candidate: (candidate.kasiski_votes, -candidate.length))
+    return _shortest_period(chosen.key)
+
+
+def recover_key(ciphertext: str, alphabet: str, max_length: int = 20, workers: int | None = None) -> str:
+    return choose_key(analyze(ciphertext, alphabet, max_length, workers), alphabet)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Криптоанализ шифра Виженера (Касиски + индекс совпадений)")
+    parser.add_argument("path", help="файл с шифртекстом")
+    parser.add_argument("--language", choices=("ru", "en"), default="ru")
+    parser.add_argument("--max-length", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    alphabet = RUSSIAN_ALPHABET if args.language == "ru" else ENGLISH_ALPHABET
+    with open(args.path, "r", encoding="utf-8") as f:
+        ciphertext = f.read()
+
+    try:
+        candidates = analyze(ciphertext, alphabet, args.max_length, args.workers)
+    except ValueError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print("длина  ключ                  IC       хи-квадрат  Касиски")
+    for candidate in candidates[:args.top]:
+        print(
+            f"{candidate.length:>5}  {candidate.key:<20}  {candidate.coincidence:.5f}  "
+            f"{candidate.chi_squared:>10.3f}  {candidate.kasiski_votes:>7}"
+        )
+    print(f"Ключ: {choose_key(candidates, alphabet)}")
+
+
+if __name__ == "__main__":
+    main()
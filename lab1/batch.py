@@ -0,0 +1,123 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from alphabet import RUSSIAN_ALPHABET, ENGLISH_ALPHABET
+from gamma import GammaCipher
+from stream import DEFAULT_CHUNK_SIZE, encrypt_file
+from vigenere import VigenereCipher
+
+ENCRYPT_PATTERN = "*.txt"
+DECRYPT_PATTERN = "*.enc"
+
+CIPHERS = {
+    "vigenere": VigenereCipher,
+    "gamma": GammaCipher,
+}
+
+
+def collect_files(patterns: list[str], file_pattern: str) -> list[tuple[str, str]]:
+    # Для каждого файла запоминается корень, относительно которого строится путь в выходном каталоге
+    files: list[tuple[str, str]] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            search = os.path.join(pattern, "**", file_pattern)
+            files.extend(
+                (path, pattern) for path in sorted(glob.glob(search, recursive=True))
+                if os.path.isfile(path)
+            )
+        else:
+            files.extend(
+                (path, os.path.dirname(path)) for path in sorted(glob.glob(pattern, recursive=True))
+                if os.path.isfile(path)
+            )
+    return files
+
+
+def output_path(src: str, root: str, output_dir: str | None, mode: str, suffix: str | None) -> str:
+    if suffix is not None:
+        name = src + suffix
+    elif mode == "encrypt":
+        name = src + ".enc"
+    else:
+        name = src[:-len(".enc")] if src.endswith(".enc") else src + ".dec"
+
+    if output_dir is None:
+        return name
+    return os.path.join(output_dir, os.path.relpath(name, root or "."))
+
+
+def process_file(src: str, dst: str, cipher_name: str, key: str, alphabet: str, mode: str,
+                 chunk_size: int) -> tuple[str, str, int, float]:
+    started = time.perf_counter()
+    # Запись поверх исходного файла уничтожила бы его при любой ошибке в середине обработки
+    if os.path.abspath(dst) == os.path.abspath(src) or (os.path.exists(dst) and os.path.samefile(src, dst)):
+        raise ValueError("Выходной файл совпадает с исходным")
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    encrypt_file(src, dst, CIPHERS[cipher_name](key, alphabet, mode), chunk_size)
+    return src, dst, os.path.getsize(src), time.perf_counter() - started
+
+
+def _rate(size: int, seconds: float) -> float:
+    return size / (1 << 20) / max(seconds, 1e-9)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Пакетное шифрование файлов шифром Виженера или гаммированием")
+    parser.add_argument("paths", nargs="+", help="файлы, каталоги или шаблоны glob")
+    parser.add_argument("--cipher", choices=sorted(CIPHERS), default="vigenere")
+    parser.add_argument("--key", required=True)
+    parser.add_argument("--language", choices=("ru", "en"), default="ru")
+    parser.add_argument("--mode", choices=("encrypt", "decrypt"), default="encrypt")
+    parser.add_argument("--output-dir", default=None, help="каталог для результатов (по умолчанию - рядом с исходными)")
+    parser.add_argument("--suffix", default=None,
+                        help="суффикс имени выходного файла (по умолчанию .enc; при расшифровании .enc снимается)")
+    parser.add_argument("--pattern", default=None,
+                        help="шаблон файлов при обходе каталогов (по умолчанию *.txt, при расшифровании *.enc)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    alphabet = RUSSIAN_ALPHABET if args.language == "ru" else ENGLISH_ALPHABET
+    pattern = args.pattern or (DECRYPT_PATTERN if args.mode == "decrypt" else ENCRYPT_PATTERN)
+    files = collect_files(args.paths, pattern)
+    if not files:
+        print("Файлы не найдены", file=sys.stderr)
+        sys.exit(1)
+
+    total_size = 0
+    failed = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(
+                process_file, src, output_path(src, root, args.output_dir, args.mode, args.suffix),
+                args.cipher, args.key, alphabet, args.mode, args.chunk_size,
+            ): src
+            for src, root in files
+        }
+        for future in as_completed(futures):
+            try:
+                src, dst, size, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"{futures[future]}: ошибка: {e}", file=sys.stderr)
+                continue
+            total_size += size
+            print(f"{src} -> {dst}: {size / (1 << 20):.2f} МБ за {seconds:.2f} с ({_rate(size, seconds):.2f} МБ/с)")
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Итого: {len(files) - failed} из {len(files)} файлов, {total_size / (1 << 20):.2f} МБ "
+        f"за {elapsed:.2f} с ({_rate(total_size, elapsed):.2f} МБ/с)"
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
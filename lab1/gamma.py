@@ -1,3 +1,7 @@
+from alphabet import Alphabet, compile_alphabet
+from stream import StreamCipher, process_text
+
+
 class PseudorandomGenerator:
     def __init__(self, seed: int):
         self.seed = seed
@@ -5,61 +9,114 @@ class PseudorandomGenerator:
         self.c = 1013904223
         self.m = 2**32
         self.current = seed
+        self.position = 0
 
     def next(self) -> int:
         self.current = (self.a * self.current + self.c) % self.m
+        self.position += 1
         return self.current
 
+    def _jump(self, steps: int) -> tuple[int, int]:
+        # Композиция x -> a*x + c с самой собой steps раз: x -> mult*x + inc
+        mult, inc = 1, 0
+        a, c = self.a, self.c
+        while steps:
+            if steps & 1:
+                mult = (mult * a) % self.m
+                inc = (inc * a + c) % self.m
+            c = ((a + 1) * c) % self.m
+            a = (a * a) % self.m
+            steps >>= 1
+        return mult, inc
+
+    def skip(self, steps: int) -> None:
+        # Период генератора равен m, поэтому отрицательный шаг - это шаг назад
+        mult, inc = self._jump(steps % self.m)
+        self.current = (mult * self.current + inc) % self.m
+        self.position += steps
+
+    def next_block(self, count: int, alphabet_size: int) -> list[int]:
+        a, c, m = self.a, self.c, self.m
+        current = self.current
+        block = [1 + (current := (a * current + c) % m) % alphabet_size for _ in range(count)]
+        self.current = current
+        self.position += count
+        return block
+
+    def seek(self, position: int) -> None:
+        if position < 0:
+            raise ValueError("Позиция генератора не может быть отрицательной")
+        self.current = self.seed
+        self.position = 0
+        self.skip(position)
+
     def next_in_range(self, min_val: int, max_val: int) -> int:
         return min_val + (self.next() % (max_val - min_val + 1))
 
 def key_to_seed(key: str, alphabet: str) -> int:
-    base = len(alphabet)
+    compiled = compile_alphabet(alphabet)
+    base = compiled.size
     value = 0
 
     for char in key:
-        index = alphabet.index(char.upper()) + 1
-        value = value * base + index
+        index = compiled.index(char)
+        if index < 0:
+            raise ValueError("Ключ содержит символы не из алфавита")
+        value = value * base + index + 1
 
     return value
 
-def _char_to_code(char: str, alphabet: str) -> int:
-    char_upper = char.upper()
-    if char_upper not in alphabet:
-        return -1
-    return alphabet.index(char_upper) + 1
+def seed_to_key(seed: int, alphabet: str) -> str:
+    # Обратное к key_to_seed: биективная система счисления с цифрами 1..len(alphabet)
+    if seed <= 0:
+        raise ValueError("Зерно должно быть положительным")
 
-def _code_to_char(code: int, alphabet: str, is_upper: bool) -> str:
-    index = (code - 1) % len(alphabet)
-    char = alphabet[index]
-    return char if is_upper else char.lower()
+    base = len(alphabet)
+    chars = []
+    while seed:
+        seed, digit = divmod(seed - 1, base)
+        chars.append(alphabet[digit])
 
-def gamma(text: str, key: str, alphabet: str, mode: str = 'encrypt') -> str:
-    if not text or not key:
+    return ''.join(reversed(chars))
+
+def _apply_gamma(text: str, compiled: Alphabet, prng: PseudorandomGenerator, mode: str) -> str:
+    alphabet_size = compiled.size
+    letters = compiled.present(text)
+    if not letters:
         return text
 
-    key_clean = key.replace(' ', '').replace('\n', '').replace('\t', '')
-    if not key_clean:
+    parts = compiled.split(text, letters)
+    stream = ''.join(parts[1::2])
+    gammas = prng.next_block(len(stream), alphabet_size)
+    sign = -1 if mode == 'decrypt' else 1
+    table = {
+        (char, value): compiled.char((compiled.index(char) + sign * value) % alphabet_size, char.isupper())
+        for char in letters
+        for value in range(1, alphabet_size + 1)
+    }
+
+    return compiled.merge(parts, ''.join(map(table.__getitem__, zip(stream, gammas))))
+
+def _has_key(key: str) -> bool:
+    return bool(key.replace(' ', '').replace('\n', '').replace('\t', ''))
+
+def gamma(text: str, key: str, alphabet: str, mode: str = 'encrypt', offset: int = 0) -> str:
+    if not text or not _has_key(key):
         return text
 
-    seed = key_to_seed(key, alphabet)
-    prng = PseudorandomGenerator(seed)
-    alphabet_size = len(alphabet)
-    result = []
-    
-    for char in text:
-        char_code = _char_to_code(char, alphabet)
-        if char_code >= 0:
-            gamma = prng.next_in_range(1, alphabet_size)
-            if mode == 'decrypt':
-                new_code = (char_code - gamma) % alphabet_size
-            else:
-                new_code = (char_code + gamma) % alphabet_size
-            if new_code == 0:
-                new_code = alphabet_size
-
-            result.append(_code_to_char(new_code, alphabet, char.isupper()))
-        else:
-            result.append(char)
-
-    return ''.join(result)
+    # Порции обрабатываются одним генератором, поэтому гамма та же, что и для всего текста сразу
+    cipher = GammaCipher(key, alphabet, mode)
+    cipher.prng.seek(offset)
+    return process_text(cipher, text)
+
+
+class GammaCipher(StreamCipher):
+    def __init__(self, key: str, alphabet: str, mode: str = 'encrypt'):
+        self.compiled = compile_alphabet(alphabet)
+        self.mode = mode
+        self.prng = PseudorandomGenerator(key_to_seed(key, alphabet)) if _has_key(key) else None
+
+    def process(self, chunk: str) -> str:
+        if self.prng is None:
+            return chunk
+        return _apply_gamma(chunk, self.compiled, self.prng, self.mode)
@@ -0,0 +1,146 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable
+
+from alphabet import RUSSIAN_ALPHABET, ENGLISH_ALPHABET, compile_alphabet
+from analysis import letter_stream
+from gamma import PseudorandomGenerator, seed_to_key
+
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+
+def known_plaintext_residues(plaintext: str, ciphertext: str, alphabet: str) -> list[int]:
+    # Для каждой буквы: gamma = 1 + x % n, поэтому x % n определяется парой открытый/шифр символ
+    plain = letter_stream(plaintext, alphabet)
+    cipher = letter_stream(ciphertext, alphabet)
+    if len(plain) != len(cipher):
+        raise ValueError("Открытый текст и шифртекст содержат разное число букв алфавита")
+    if not plain:
+        raise ValueError("Нет букв алфавита для поиска ключа")
+
+    compiled = compile_alphabet(alphabet)
+    return [
+        (compiled.index(c) - compiled.index(p) - 1) % compiled.size
+        for p, c in zip(plain, cipher)
+    ]
+
+
+def _matches(state: int, residues: list[int], a: int, c: int, m: int, size: int) -> bool:
+    for residue in residues:
+        state = (a * state + c) % m
+        if state % size != residue:
+            return False
+    return True
+
+
+def _scan_states(start: int, stop: int, residues: list[int], size: int) -> list[int]:
+    # Перебор первого состояния x1 с x1 % size == residues[0]; зерно восстанавливается обращением шага
+    prng = PseudorandomGenerator(0)
+    a, c, m = prng.a, prng.c, prng.m
+    a_inverse = pow(a, -1, m)
+    first, rest = residues[0], residues[1:]
+    offset = (first - start) % size
+
+    found = []
+    for state in range(start + offset, stop, size):
+        if _matches(state, rest, a, c, m, size):
+            found.append((a_inverse * (state - c)) % m)
+    return found
+
+
+def _scan_seeds(start: int, stop: int, residues: list[int], size: int) -> list[int]:
+    prng = PseudorandomGenerator(0)
+    a, c, m = prng.a, prng.c, prng.m
+
+    first, rest = residues[0], residues[1:]
+
+    found = []
+    for seed in range(start, stop):
+        state = (a * seed + c) % m
+        if state % size == first and _matches(state, rest, a, c, m, size):
+            found.append(seed)
+    return found
+
+
+def _report(done: int, total: int, started: float) -> None:
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(
+        f"\r{done}/{total} ({100 * done / total:.1f}%), {done / elapsed:,.0f} seeds/s",
+        end="", file=sys.stderr, flush=True,
+    )
+
+
+def _run(scan: Callable, start: int, stop: int, residues: list[int], size: int, workers: int | None,
+         chunk_size: int, progress: Callable[[int, int, float], None] | None) -> list[int]:
+    bounds = [(lo, min(lo + chunk_size, stop)) for lo in range(start, stop, chunk_size)]
+    total = stop - start
+    done = 0
+    found: list[int] = []
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(scan, lo, hi, residues, size): hi - lo
+            for lo, hi in bounds
+        }
+        for future in as_completed(futures):
+            found.extend(future.result())
+            done += futures[future]
+            if progress is not None:
+                progress(done, total, started)
+
+    return sorted(found)
+
+
+def search_seeds(residues: list[int], alphabet_size: int, workers: int | None = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, progress: Callable | None = None) -> list[int]:
+    m = PseudorandomGenerator(0).m
+    return _run(_scan_states, 0, m, residues, alphabet_size, workers, chunk_size, progress)
+
+
+def search_keys(residues: list[int], alphabet: str, max_length: int, workers: int | None = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, progress: Callable | None = None) -> list[str]:
+    # Ключи длины до max_length взаимно однозначно соответствуют зёрнам 1..sum(n**k)
+    size = len(alphabet)
+    last_seed = sum(size ** length for length in range(1, max_length + 1))
+    seeds = _run(_scan_seeds, 1, last_seed + 1, residues, size, workers, chunk_size, progress)
+    return [seed_to_key(seed, alphabet) for seed in seeds]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Поиск ключа гаммирования по известному открытому тексту")
+    parser.add_argument("plaintext", help="известный фрагмент открытого текста")
+    parser.add_argument("ciphertext", help="соответствующий фрагмент шифртекста")
+    parser.add_argument("--language", choices=("ru", "en"), default="ru")
+    parser.add_argument("--max-length", type=int, default=None,
+                        help="перебирать ключи до этой длины (по умолчанию - всё пространство 2**32 зёрен)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    alphabet = RUSSIAN_ALPHABET if args.language == "ru" else ENGLISH_ALPHABET
+    try:
+        residues = known_plaintext_residues(args.plaintext, args.ciphertext, alphabet)
+    except ValueError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    if args.max_length is None:
+        seeds = search_seeds(residues, len(alphabet), args.workers, args.chunk_size, _report)
+        m = PseudorandomGenerator(0).m
+        results = [f"зерно {seed} (ключ {seed_to_key(seed or m, alphabet)})" for seed in seeds]
+    else:
+        keys = search_keys(residues, alphabet, args.max_length, args.workers, args.chunk_size, _report)
+        results = [f"ключ {key}" for key in keys]
+
+    print(file=sys.stderr)
+    print(f"Найдено кандидатов: {len(results)} за {time.perf_counter() - started:.1f} с")
+    for line in results:
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
 import sys
+from itertools import islice
 from PySide6.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile, QIODevice
-from vigenere import vigenere
-from gamma import gamma
+from alphabet import RUSSIAN_ALPHABET, ENGLISH_ALPHABET, compile_alphabet
+from vigenere import VigenereCipher
+from gamma import GammaCipher
+from stream import process_text
+from worker import Job, JobRunner
 
-RUSSIAN_ALPHABET = 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'
-ENGLISH_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+def run_cipher(method: str, text: str, key: str, alphabet: str, mode: str, progress=None) -> str:
+    if method == "Шифр Виженера":
+        cipher = VigenereCipher(key, alphabet, mode)
+    else:
+        cipher = GammaCipher(key, alphabet, mode)
+    return process_text(cipher, text, progress=progress)
 
 
 class MainWindow(QMainWindow):
@@ -14,6 +23,7 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.load_ui()
         self.setup_connections()
+        self.jobs = JobRunner(self, [self.ui.showResultBtn, self.ui.loadFileBtn])
         
     def load_ui(self):
         ui_file = QFile("mainwindow.ui")
@@ -53,18 +63,14 @@ class MainWindow(QMainWindow):
         if not text:
             return True, ""
         
-        alphabet_upper = alphabet.upper()
-        alphabet_lower = alphabet.lower()
-        invalid_chars = []
-        
-        for char in text:
-            if char.isalpha():
-                if char.upper() not in alphabet_upper and char.lower() not in alphabet_lower:
-                    if char not in invalid_chars:
-                        invalid_chars.append(char)
+        compiled = compile_alphabet(alphabet)
+        # dict.fromkeys за один проход оставляет различные символы в порядке первого появления
+        invalid_chars = list(islice(
+            (char for char in dict.fromkeys(text) if char.isalpha() and char not in compiled), 5
+        ))
         
         if invalid_chars:
-            return False, ", ".join(invalid_chars[:5])
+            return False, ", ".join(invalid_chars)
         return True, ""
     
     def process_encryption(self):
@@ -103,13 +109,15 @@ class MainWindow(QMainWindow):
             )
             return
         
-        if method == "Шифр Виженера":
-            result = vigenere(text, key, alphabet, mode)
-        else:
-            result = gamma(text, key, alphabet, mode)
-        
+        job = Job(run_cipher, method, text, key, alphabet, mode, with_progress=True)
+        self.jobs.start(job, self.show_result, self.show_error)
+    
+    def show_result(self, result: str):
         self.ui.resultText.setPlainText(result)
     
+    def show_error(self, message: str):
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при обработке данных:\n{message}")
+    
     def load_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
@@ -0,0 +1,56 @@
+import os
+import secrets
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Iterator, TextIO
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class StreamCipher(ABC):
+    @abstractmethod
+    def process(self, chunk: str) -> str:
+        ...
+
+    def encrypt_stream(self, reader: TextIO, writer: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        if chunk_size <= 0:
+            raise ValueError("Размер блока должен быть положительным")
+
+        total = 0
+        while True:
+            chunk = reader.read(chunk_size)
+            if not chunk:
+                return total
+            writer.write(self.process(chunk))
+            total += len(chunk)
+
+
+def process_text(cipher: StreamCipher, text: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 progress: Callable[[int, int], None] | None = None) -> str:
+    parts = []
+    for start in range(0, len(text), chunk_size):
+        parts.append(cipher.process(text[start:start + chunk_size]))
+        if progress is not None:
+            progress(min(start + chunk_size, len(text)), len(text))
+    return ''.join(parts)
+
+
+@contextmanager
+def _replace_on_success(dst: str) -> Iterator[TextIO]:
+    # Результат пишется во временный файл рядом с dst и заменяет его только после успешного завершения;
+    # при ошибке удаляется только временный файл, существующий dst не трогается
+    tmp = f"{dst}.{secrets.token_hex(4)}.tmp"
+    writer = os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), 'w', encoding='utf-8', newline='')
+    try:
+        with writer:
+            yield writer
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def encrypt_file(src: str, dst: str, cipher: StreamCipher, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    with open(src, 'r', encoding='utf-8', newline='') as reader, _replace_on_success(dst) as writer:
+        return cipher.encrypt_stream(reader, writer, chunk_size)
@@ -1,22 +1,92 @@
+import sys
+from array import array
+
+from alphabet import Alphabet, compile_alphabet
+from stream import StreamCipher, process_text
+
+_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+def _key_shifts(key: str, compiled: Alphabet, mode: str) -> list[int]:
+    key = key.replace(' ', '').upper()
+    shifts = [compiled.index(char) for char in key]
+    if min(shifts, default=0) < 0:
+        raise ValueError("Ключ содержит символы не из алфавита")
+    if mode == 'decrypt':
+        shifts = [-shift for shift in shifts]
+    return shifts
+
+
+def _shift_table(letters: str, compiled: Alphabet, shift: int) -> dict[int, str]:
+    return {
+        ord(char): compiled.char((compiled.index(char) + shift) % compiled.size, char.isupper())
+        for char in letters
+    }
+
+
 def vigenere(text: str, key: str, alphabet: str, mode: str = 'encrypt') -> str:
     if not key.strip():
         return text
     
-    alphabet_size = len(alphabet)
-    key = key.replace(' ', '').upper()
+    compiled = compile_alphabet(alphabet)
+    alphabet_size = compiled.size
+    shifts = _key_shifts(key, compiled, mode)
+    key_length = len(shifts)
     result = []
     key_index = 0
 
     for char in text:
-        if char.upper() in alphabet:
-            shift = alphabet.index(key[key_index % len(key)])
-            if mode == 'decrypt':
-                shift = -shift
-            pos = alphabet.index(char.upper())
-            new_char = alphabet[(pos + shift) % alphabet_size]
-            result.append(new_char if char.isupper() else new_char.lower())
+        pos = compiled.index(char)
+        if pos >= 0:
+            shift = shifts[key_index % key_length]
+            result.append(compiled.char((pos + shift) % alphabet_size, char.isupper()))
             key_index += 1
         else:
             result.append(char)
     
     return ''.join(result)
+
+
+def _apply_shifts(text: str, compiled: Alphabet, shifts: list[int]) -> tuple[str, int]:
+    letters = compiled.present(text)
+    if not letters:
+        return text, 0
+
+    parts = compiled.split(text, letters)
+    stream = ''.join(parts[1::2])
+    codes = array('I', bytes(4 * len(stream)))
+    key_length = len(shifts)
+    tables: dict[int, dict[int, str]] = {}
+
+    for key_index, shift in enumerate(shifts):
+        table = tables.get(shift)
+        if table is None:
+            table = tables[shift] = _shift_table(letters, compiled, shift)
+        column = stream[key_index::key_length].translate(table)
+        codes[key_index::key_length] = array('I', column.encode(_UTF32))
+
+    return compiled.merge(parts, codes.tobytes().decode(_UTF32)), len(stream)
+
+
+def vigenere_bulk(text: str, key: str, alphabet: str, mode: str = 'encrypt') -> str:
+    if not key.strip():
+        return text
+
+    # Текст обрабатывается порциями: разбиение всего текста сразу требует десятков байт памяти на символ
+    return process_text(VigenereCipher(key, alphabet, mode), text)
+
+
+class VigenereCipher(StreamCipher):
+    def __init__(self, key: str, alphabet: str, mode: str = 'encrypt'):
+        self.compiled = compile_alphabet(alphabet)
+        self.shifts = _key_shifts(key, self.compiled, mode) if key.strip() else []
+        self.key_index = 0
+
+    def process(self, chunk: str) -> str:
+        if not self.shifts:
+            return chunk
+
+        start = self.key_index % len(self.shifts)
+        result, consumed = _apply_shifts(chunk, self.compiled, self.shifts[start:] + self.shifts[:start])
+        self.key_index += consumed
+        return result
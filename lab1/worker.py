@@ -0,0 +1,107 @@
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtWidgets import QMainWindow, QWidget
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobSignals(QObject):
+    # Байтовые счётчики больших файлов не помещаются в 32-битный int
+    progress = Signal("qint64", "qint64")
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class Job(QRunnable):
+    def __init__(self, func: Callable[..., Any], *args: Any, with_progress: bool = False, **kwargs: Any) -> None:
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        if with_progress:
+            self.kwargs["progress"] = self.report
+        self.signals = JobSignals()
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def report(self, done: int, total: int) -> None:
+        if self._cancelled:
+            raise JobCancelled()
+        self.signals.progress.emit(done, total)
+
+    def run(self) -> None:
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as exc:
+            if self._cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(exc))
+        else:
+            if self._cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+
+class JobRunner(QObject):
+    def __init__(self, window: QMainWindow, busy_widgets: list[QWidget]) -> None:
+        super().__init__(window)
+        self.window = window
+        self.busy_widgets = busy_widgets
+        self.pool = QThreadPool.globalInstance()
+        self.job: Job | None = None
+        self.shortcut = QShortcut(QKeySequence(Qt.Key_Escape), window)
+        self.shortcut.activated.connect(self.cancel)
+
+    def start(self, job: Job, on_finished: Callable[[Any], None], on_failed: Callable[[str], None]) -> bool:
+        if self.job is not None:
+            self.window.statusBar().showMessage("Дождитесь завершения текущей операции (Esc - отмена)")
+            return False
+
+        self.job = job
+        job.signals.progress.connect(self._on_progress)
+        job.signals.finished.connect(on_finished)
+        job.signals.failed.connect(on_failed)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.cancelled.connect(self._on_cancelled)
+
+        for widget in self.busy_widgets:
+            widget.setEnabled(False)
+        self.window.statusBar().showMessage("Выполняется... (Esc - отмена)")
+        self.pool.start(job)
+        return True
+
+    def cancel(self) -> None:
+        if self.job is not None:
+            self.job.cancel()
+            self.window.statusBar().showMessage("Отмена...")
+
+    def _on_progress(self, done: int, total: int) -> None:
+        if total > 0:
+            self.window.statusBar().showMessage(f"Выполняется... {100 * done // total}% (Esc - отмена)")
+
+    def _on_finished(self, _result: Any) -> None:
+        self._release("Готово")
+
+    def _on_failed(self, _message: str) -> None:
+        self._release("Ошибка")
+
+    def _on_cancelled(self) -> None:
+        self._release("Операция отменена")
+
+    def _release(self, message: str) -> None:
+        self.job = None
+        for widget in self.busy_widgets:
+            widget.setEnabled(True)
+        self.window.statusBar().showMessage(message, 5000)
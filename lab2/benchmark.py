@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, NamedTuple
+
+from bitslice import bitslice_ecb
+from des import (
+    DESCipher, TripleDESCipher, bytes_to_uint64_blocks, cipher_for_key, generate_keys, get_cipher,
+    process_block, uint64_blocks_to_bytes,
+)
+from modes import PARALLEL_MIN_BLOCKS, process_blocks
+
+DEFAULT_SIZES = "1K,1M,100M"
+DEFAULT_OUTPUT = "benchmark.json"
+KEY_SCHEDULE_ROUNDS = 2000
+
+# (ключ, открытый текст, шифртекст): FIPS 46/81, NIST SP 800-17 и SP 800-67
+DES_VECTORS = [
+    ("133457799BBCDFF1", "0123456789ABCDEF", "85E813540F0AB405"),
+    ("0123456789ABCDEF", "4E6F772069732074", "3FA40E8A984D4815"),
+    ("0E329232EA6D0D73", "8787878787878787", "0000000000000000"),
+    ("0101010101010101", "8000000000000000", "95F8A5E5DD31D900"),
+    ("0101010101010101", "4000000000000000", "DD7F121CA5015619"),
+    ("0101010101010101", "2000000000000000", "2E8653104F3834EA"),
+    ("8001010101010101", "0000000000000000", "95A8D72813DAA94D"),
+    ("4001010101010101", "0000000000000000", "0EEC1487DD8C26D5"),
+]
+TDES_VECTORS = [
+    (
+        "0123456789ABCDEF23456789ABCDEF01456789ABCDEF0123",
+        "5468652071756663",
+        "A826FD8CE53B855F",
+    ),
+]
+
+
+class NaiveTripleDES:
+    # Три независимых вызова DES: на каждый блок три пары IP/IP_INV
+    def __init__(self, key: bytes):
+        self.ciphers = [get_cipher(int.from_bytes(key[i:i + 8], "big")) for i in (0, 8, 16)]
+
+    def encrypt_block(self, block64: int) -> int:
+        c1, c2, c3 = self.ciphers
+        return c3.encrypt_block(c2.decrypt_block(c1.encrypt_block(block64)))
+
+    def decrypt_block(self, block64: int) -> int:
+        c1, c2, c3 = self.ciphers
+        return c1.decrypt_block(c2.encrypt_block(c3.decrypt_block(block64)))
+
+
+class Engine(NamedTuple):
+    name: str
+    # (данные кратные 8 байтам, ключ, режим) -> результат ECB без дополнения
+    run: Callable[[bytes, bytes, str], bytes]
+    key_size: int
+    # Минимальное число блоков, при котором включается проверяемый путь
+    min_blocks: int = 1
+    # Наибольший объём для замера скорости; None - без ограничения
+    max_size: int | None = None
+
+
+def _reference(data: bytes, key: bytes, mode: str) -> bytes:
+    keys = generate_keys(int.from_bytes(key, "big"))
+    return uint64_blocks_to_bytes([process_block(block, keys, mode) for block in bytes_to_uint64_blocks(data)])
+
+
+def _sp_table(data: bytes, key: bytes, mode: str) -> bytes:
+    # Поблочный путь на SP-таблицах без пакетной обработки, которую process_blocks включает для ECB
+    cipher = cipher_for_key(key)
+    crypt = cipher.decrypt_block if mode == "decrypt" else cipher.encrypt_block
+    return uint64_blocks_to_bytes([crypt(block) for block in bytes_to_uint64_blocks(data)])
+
+
+def _blocks_engine(data: bytes, key: bytes, mode: str, workers: int | None = None) -> bytes:
+    return uint64_blocks_to_bytes(
+        process_blocks(cipher_for_key(key), bytes_to_uint64_blocks(data), mode, "ECB", 0, workers)
+    )
+
+
+def _naive_tdes(data: bytes, key: bytes, mode: str) -> bytes:
+    return uint64_blocks_to_bytes(
+        process_blocks(NaiveTripleDES(key), bytes_to_uint64_blocks(data), mode)
+    )
+
+
+def _bitslice(data: bytes, key: bytes, mode: str) -> bytes:
+    return bitslice_ecb(data, get_cipher(int.from_bytes(key, "big")), mode)
+
+
+def make_engines(workers: int) -> list[Engine]:
+    engines = [
+        Engine("reference", _reference, 8, max_size=1 << 16),
+        Engine("fast", _sp_table, 8, max_size=1 << 20),
+        Engine("bitslice", _bitslice, 8),
+        Engine("3des-ede", _blocks_engine, 24, max_size=1 << 20),
+        Engine("3des-naive", _naive_tdes, 24, max_size=1 << 20),
+    ]
+    # С одним процессом process_blocks не включает параллельный путь, и замер повторял бы "bitslice"
+    if workers >= 2:
+        engines.insert(2, Engine(
+            f"parallel-{workers}", lambda data, key, mode: _blocks_engine(data, key, mode, workers), 8,
+            min_blocks=PARALLEL_MIN_BLOCKS, max_size=workers << 20,
+        ))
+    return engines
+
+
+def check_vectors(engine: Engine) -> list[dict]:
+    vectors = DES_VECTORS if engine.key_size == 8 else TDES_VECTORS
+    results = []
+    for key_hex, plain_hex, cipher_hex in vectors:
+        key = bytes.fromhex(key_hex)
+        plain = bytes.fromhex(plain_hex) * engine.min_blocks
+        expected = bytes.fromhex(cipher_hex) * engine.min_blocks
+        encrypted = engine.run(plain, key, "encrypt")
+        decrypted = engine.run(expected, key, "decrypt")
+        results.append({
+            "key": key_hex,
+            "plaintext": plain_hex,
+            "ciphertext": cipher_hex,
+            "got": encrypted[:8].hex().upper(),
+            "passed": encrypted == expected and decrypted == plain,
+        })
+    return results
+
+
+def parse_size(text: str) -> int:
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+def _rate(size: int, seconds: float) -> float:
+    return size / (1 << 20) / max(seconds, 1e-9)
+
+
+def _timed(func: Callable, *args) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def measure_throughput(engine: Engine, data: bytes, key: bytes) -> dict:
+    if engine.max_size is not None and len(data) > engine.max_size:
+        return {"skipped": f"больше {engine.max_size} байт"}
+    encrypt_seconds, encrypted = _timed(engine.run, data, key[:engine.key_size], "encrypt")
+    decrypt_seconds, decrypted = _timed(engine.run, encrypted, key[:engine.key_size], "decrypt")
+    return {
+        "encrypt_mb_s": _rate(len(data), encrypt_seconds),
+        "decrypt_mb_s": _rate(len(data), decrypt_seconds),
+        "round_trip_ok": decrypted == data,
+    }
+
+
+def measure_key_schedule(rounds: int = KEY_SCHEDULE_ROUNDS) -> dict:
+    keys = [int.from_bytes(os.urandom(8), "big") for _ in range(rounds)]
+    des_seconds, _ = _timed(lambda: [DESCipher(key) for key in keys])
+    tdes_seconds, _ = _timed(lambda: [TripleDESCipher(key, key ^ 1, key ^ 2) for key in keys])
+    return {
+        "des_us": des_seconds / rounds * 1e6,
+        "3des_us": tdes_seconds / rounds * 1e6,
+    }
+
+
+def measure_conversion(data: bytes) -> dict:
+    pack_seconds, blocks = _timed(bytes_to_uint64_blocks, data)
+    unpack_seconds, _ = _timed(uint64_blocks_to_bytes, blocks)
+    return {
+        "pack_mb_s": _rate(len(data), pack_seconds),
+        "unpack_mb_s": _rate(len(data), unpack_seconds),
+    }
+
+
+def run_suite(sizes: list[int], workers: int) -> dict:
+    engines = make_engines(workers)
+    key = os.urandom(24)
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "known_answer": {engine.name: check_vectors(engine) for engine in engines},
+        "key_schedule": measure_key_schedule(),
+        "conversion": {},
+        "throughput": {engine.name: {} for engine in engines},
+    }
+    for size in sizes:
+        data = os.urandom(size - size % 8)
+        report["conversion"][str(size)] = measure_conversion(data)
+        for engine in engines:
+            report["throughput"][engine.name][str(size)] = measure_throughput(engine, data, key)
+    return report
+
+
+def print_report(report: dict) -> None:
+    for name, results in report["known_answer"].items():
+        passed = sum(result["passed"] for result in results)
+        print(f"KAT {name:<12} {passed}/{len(results)}")
+    schedule = report["key_schedule"]
+    print(f"Ключевое расписание: DES {schedule['des_us']:.1f} мкс, 3DES {schedule['3des_us']:.1f} мкс")
+
+    print("движок        объём       шифр. МБ/с  расшифр. МБ/с")
+    for name, by_size in report["throughput"].items():
+        for size, result in by_size.items():
+            if "skipped" in result:
+                print(f"{name:<12}  {size:>10}  пропущено ({result['skipped']})")
+            else:
+                print(f"{name:<12}  {size:>10}  {result['encrypt_mb_s']:>10.3f}  {result['decrypt_mb_s']:>13.3f}")
+    for size, result in report["conversion"].items():
+        print(f"упаковка     {size:>10}  {result['pack_mb_s']:>10.1f}  {result['unpack_mb_s']:>13.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Проверка DES по эталонным векторам и замер скорости")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="объёмы данных через запятую (например 1K,1M,100M)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="число процессов параллельного пути")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="файл для результатов в формате JSON")
+    args = parser.parse_args()
+
+    report = run_suite([parse_size(size) for size in args.sizes.split(",")], args.workers)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print_report(report)
+
+    failed = [name for name, results in report["known_answer"].items() if not all(r["passed"] for r in results)]
+    if failed:
+        print(f"Несовпадение с эталонными векторами: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
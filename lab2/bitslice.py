@@ -0,0 +1,142 @@
+from functools import lru_cache
+
+from des import E, IP, IP_INV, P, S_BLOCKS, DESCipher
+
+BATCH_BLOCKS = 1 << 16
+
+# Коды операций булевой схемы S-блока
+_AND, _OR, _XOR, _ANDNOT, _NOT = range(5)
+# Регистры 0..5 - входные биты S-блока, 6 и 7 - константы 0 и 1
+_ZERO, _ONE = 6, 7
+
+_BIT_TO_ASCII = [
+    bytes(0x31 if (value >> (7 - bit)) & 1 else 0x30 for value in range(256))
+    for bit in range(8)
+]
+_ASCII_TO_BIT = bytes.maketrans(b"01", b"\x00\x01")
+
+
+@lru_cache(maxsize=None)
+def _sbox_program(box: int, key_bits: int) -> tuple[tuple[tuple[int, int, int], ...], tuple[int, ...]]:
+    # Схема строится разложением Шеннона по входным битам b1..b6 с подстановкой констант и общими
+    # подсхемами. Биты раундового ключа сразу учтены в таблице истинности: S(x ^ key_bits).
+    truth = [0, 0, 0, 0]
+    for x in range(64):
+        six_bits = x ^ key_bits
+        row = ((six_bits & 0x20) >> 4) | (six_bits & 0x01)
+        col = (six_bits >> 1) & 0x0F
+        value = S_BLOCKS[box][row][col]
+        for out in range(4):
+            if (value >> (3 - out)) & 1:
+                truth[out] |= 1 << x
+
+    program: list[tuple[int, int, int]] = []
+    memo: dict[tuple[int, int], int] = {}
+
+    def emit(op: int, a: int, b: int = 0) -> int:
+        program.append((op, a, b))
+        return 8 + len(program) - 1
+
+    def mux(select: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        if low == _ZERO:
+            return select if high == _ONE else emit(_AND, high, select)
+        if low == _ONE:
+            inverted = emit(_NOT, select)
+            return inverted if high == _ZERO else emit(_OR, high, inverted)
+        if high == _ZERO:
+            return emit(_ANDNOT, low, select)
+        if high == _ONE:
+            return emit(_OR, low, select)
+        diff = emit(_XOR, low, high)
+        return emit(_XOR, low, emit(_AND, diff, select))
+
+    def build(table: int, var: int) -> int:
+        width = 1 << (6 - var)
+        if table == 0:
+            return _ZERO
+        if table == (1 << width) - 1:
+            return _ONE
+        reg = memo.get((table, var))
+        if reg is None:
+            half = width >> 1
+            low = build(table & ((1 << half) - 1), var + 1)
+            high = build(table >> half, var + 1)
+            reg = memo[(table, var)] = mux(var, low, high)
+        return reg
+
+    outputs = tuple(build(table, 0) for table in truth)
+    return tuple(program), outputs
+
+
+def _run_sbox(box: int, key_bits: int, inputs: list[int], full: int) -> list[int]:
+    program, outputs = _sbox_program(box, key_bits)
+    regs = inputs + [0, full]
+    append = regs.append
+    for op, a, b in program:
+        if op == _XOR:
+            append(regs[a] ^ regs[b])
+        elif op == _AND:
+            append(regs[a] & regs[b])
+        elif op == _OR:
+            append(regs[a] | regs[b])
+        elif op == _ANDNOT:
+            append(regs[a] & ~regs[b])
+        else:
+            append(regs[a] ^ full)
+    return [regs[reg] for reg in outputs]
+
+
+def to_planes(data: bytes) -> list[int]:
+    # Плоскость j - это бит j+1 (в нумерации таблиц DES) всех блоков; первый блок - старший бит
+    planes = []
+    for byte_index in range(8):
+        column = data[byte_index::8]
+        for bit in range(8):
+            planes.append(int(column.translate(_BIT_TO_ASCII[bit]), 2))
+    return planes
+
+
+def from_planes(planes: list[int], count: int) -> bytes:
+    result = bytearray(8 * count)
+    for byte_index in range(8):
+        column = 0
+        for bit in range(8):
+            bits = format(planes[8 * byte_index + bit], f"0{count}b").encode("ascii")
+            column |= int.from_bytes(bits.translate(_ASCII_TO_BIT), "big") << (7 - bit)
+        result[byte_index::8] = column.to_bytes(count, "big")
+    return bytes(result)
+
+
+def _encrypt_planes(planes: list[int], keys: list[int], full: int) -> list[int]:
+    # Перестановки IP, E, P и IP_INV - только переименование плоскостей
+    chunk = [planes[pos - 1] for pos in IP]
+    left, right = chunk[:32], chunk[32:]
+
+    for subkey in keys:
+        expanded = [right[pos - 1] for pos in E]
+        substituted: list[int] = []
+        for box in range(8):
+            key_bits = (subkey >> (42 - 6 * box)) & 0x3F
+            substituted.extend(_run_sbox(box, key_bits, expanded[6 * box:6 * box + 6], full))
+        left, right = right, [l ^ substituted[pos - 1] for l, pos in zip(left, P)]
+
+    chunk = right + left
+    return [chunk[pos - 1] for pos in IP_INV]
+
+
+def bitslice_ecb(data: bytes, cipher: DESCipher, mode: str = "encrypt", batch_blocks: int = BATCH_BLOCKS) -> bytes:
+    # Точка входа для пакетного ECB одинарного DES: process_blocks попадает сюда через DESCipher.process_ecb
+    if len(data) % 8:
+        raise ValueError("Длина данных должна быть кратна 8 байтам")
+    keys = cipher.keys(mode)
+
+    result = bytearray()
+    step = 8 * batch_blocks
+    for start in range(0, len(data), step):
+        batch = data[start:start + step]
+        count = len(batch) // 8
+        full = (1 << count) - 1
+        result += from_planes(_encrypt_planes(to_planes(batch), keys, full), count)
+    return bytes(result)
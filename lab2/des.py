@@ -1,4 +1,16 @@
 import base64
+import secrets
+import sys
+from array import array
+from functools import lru_cache
+from typing import Callable, Sequence
+
+from modes import process_blocks
+
+CIPHER_CACHE_SIZE = 64
+# 8 байт - DES, 16 байт - двухключевой 3DES (K1, K2, K1), 24 байта - трёхключевой 3DES
+KEY_SIZES = (8, 16, 24)
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
 
 IP = [
     58, 50, 42, 34, 26, 18, 10, 2, 60, 52, 44, 36, 28, 20, 12, 4,
@@ -106,7 +118,7 @@ S_BLOCKS = [
     ]
 ]
 
-def permute(value: int, table: list[int], in_bits: int) -> int:
+def _permute_bits(value: int, table: list[int], in_bits: int) -> int:
     result = 0
     out_len = len(table)
     
@@ -117,6 +129,43 @@ def permute(value: int, table: list[int], in_bits: int) -> int:
     return result
 
 
+_PERMUTATIONS: dict[tuple[int, int], tuple[list[int], tuple[tuple[int, ...], ...]]] = {}
+
+
+def compile_permutation(table: list[int], in_bits: int) -> tuple[tuple[int, ...], ...]:
+    # По таблице на каждый входной байт (от старшего): значение байта -> его биты на выходных позициях.
+    # Таблицы строятся при первом обращении; сама таблица хранится в кэше, поэтому id не переиспользуется.
+    key = (id(table), in_bits)
+    entry = _PERMUTATIONS.get(key)
+    if entry is None or entry[0] is not table:
+        lookups = tuple(
+            tuple(_permute_bits(byte << shift, table, in_bits) for byte in range(256))
+            for shift in range(in_bits - 8, -1, -8)
+        )
+        entry = _PERMUTATIONS[key] = (table, lookups)
+    return entry[1]
+
+
+def permute(value: int, table: list[int], in_bits: int) -> int:
+    if in_bits % 8:
+        return _permute_bits(value, table, in_bits)
+
+    result = 0
+    shift = in_bits - 8
+    for lookup in compile_permutation(table, in_bits):
+        result |= lookup[(value >> shift) & 0xFF]
+        shift -= 8
+    return result
+
+
+def _permute64(value: int, lookups: tuple[tuple[int, ...], ...]) -> int:
+    t0, t1, t2, t3, t4, t5, t6, t7 = lookups
+    return (
+        t0[value >> 56] | t1[(value >> 48) & 0xFF] | t2[(value >> 40) & 0xFF] | t3[(value >> 32) & 0xFF]
+        | t4[(value >> 24) & 0xFF] | t5[(value >> 16) & 0xFF] | t6[(value >> 8) & 0xFF] | t7[value & 0xFF]
+    )
+
+
 def generate_keys(key64: int) -> list[int]:
     key56 = permute(key64, PC1, 64)
     
@@ -145,25 +194,43 @@ def key_text_to_uint64(key_text: str) -> int:
 
     return int.from_bytes(key_bytes, byteorder="big", signed=False)
 
-def bytes_to_uint64_blocks(data: bytes) -> list[int]:
+def key_to_bytes(key: str | bytes | bytearray | memoryview) -> bytes:
+    key_bytes = key.encode("utf-8") if isinstance(key, str) else bytes(key)
+    if len(key_bytes) not in KEY_SIZES:
+        raise ValueError(
+            f"Ключ должен содержать 8 байт (DES), 16 или 24 байта (3DES), сейчас {len(key_bytes)} байт"
+        )
+    return key_bytes
+
+def bytes_to_uint64_blocks(data: bytes) -> array:
     if len(data) % 8 != 0:
         pad_len = 8 - (len(data) % 8)
         data += b"\x00" * pad_len
 
-    blocks: list[int] = []
-    for i in range(0, len(data), 8):
-        block = int.from_bytes(data[i:i + 8], byteorder="big", signed=False)
-        blocks.append(block)
-
+    # Блоки хранятся упакованными по 8 байт; порядок байт блока - big-endian
+    blocks = array("Q")
+    blocks.frombytes(data)
+    if _NATIVE_LITTLE_ENDIAN:
+        blocks.byteswap()
     return blocks
 
-def uint64_blocks_to_bytes(blocks: list[int]) -> bytes:
-    result = bytearray()
-    for block in blocks:
-        result.extend(block.to_bytes(8, byteorder="big", signed=False))
-    
-    result = result.rstrip(b"\x00")
-    return result
+def uint64_blocks_to_bytes(blocks: Sequence[int]) -> bytes:
+    packed = array("Q", blocks)
+    if _NATIVE_LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+def pkcs7_pad(data: bytes, block_size: int = 8) -> bytes:
+    pad_len = block_size - len(data) % block_size
+    return data + bytes([pad_len]) * pad_len
+
+def pkcs7_unpad(data: bytes, block_size: int = 8) -> bytes:
+    if not data or len(data) % block_size:
+        raise ValueError("Некорректная длина данных для снятия дополнения")
+    pad_len = data[-1]
+    if not 1 <= pad_len <= block_size or data[-pad_len:] != bytes([pad_len]) * pad_len:
+        raise ValueError("Некорректное дополнение PKCS#7 (неверный ключ или повреждённые данные)")
+    return data[:-pad_len]
 
 
 def sbox_substitution(x48: int) -> int:
@@ -190,6 +257,55 @@ def feistel(right32: int, subkey48: int) -> int:
     return permute(substituted, P, 32)
 
 
+@lru_cache(maxsize=None)
+def _sp_tables() -> tuple[tuple[int, ...], ...]:
+    # Для каждого S-блока: 6 входных бит -> его 4 выходных бита, уже переставленные через P
+    tables = []
+    for i in range(8):
+        shift = 28 - 4 * i
+        table = []
+        for six_bits in range(64):
+            row = ((six_bits & 0x20) >> 4) | (six_bits & 0x01)
+            col = (six_bits >> 1) & 0x0F
+            table.append(permute(S_BLOCKS[i][row][col] << shift, P, 32))
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+def feistel_fast(right32: int, subkey48: int) -> int:
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = _sp_tables()
+    # 34-битное кольцо (r32, r1..r32, r1): группа i расширения E - это 6 бит со сдвигом 28 - 4i
+    ring = ((right32 & 1) << 33) | (right32 << 1) | (right32 >> 31)
+    return (
+        sp0[((ring >> 28) ^ (subkey48 >> 42)) & 0x3F]
+        | sp1[((ring >> 24) ^ (subkey48 >> 36)) & 0x3F]
+        | sp2[((ring >> 20) ^ (subkey48 >> 30)) & 0x3F]
+        | sp3[((ring >> 16) ^ (subkey48 >> 24)) & 0x3F]
+        | sp4[((ring >> 12) ^ (subkey48 >> 18)) & 0x3F]
+        | sp5[((ring >> 8) ^ (subkey48 >> 12)) & 0x3F]
+        | sp6[((ring >> 4) ^ (subkey48 >> 6)) & 0x3F]
+        | sp7[(ring ^ subkey48) & 0x3F]
+    )
+
+
+def process_block_fast(block64: int, keys: list[int], mode: str = "encrypt") -> int:
+    if mode == "decrypt":
+        keys = keys[::-1]
+    return _crypt_block(block64, keys)
+
+
+def _crypt_block(block64: int, keys: list[int]) -> int:
+    chunk = _permute64(block64, compile_permutation(IP, 64))
+
+    left = chunk >> 32
+    right = chunk & 0xFFFFFFFF
+
+    for subkey in keys:
+        left, right = right, left ^ feistel_fast(right, subkey)
+
+    return _permute64((right << 32) | left, compile_permutation(IP_INV, 64))
+
+
 def process_block(block64: int, keys: list[int], mode: str = "encrypt") -> int:
     if mode == "decrypt":
         keys = keys[::-1]
@@ -210,31 +326,132 @@ def process_block(block64: int, keys: list[int], mode: str = "encrypt") -> int:
     return cipher_chunk
 
 
-def des(plaintext: str, key_text: str, mode: str = "encrypt") -> str:
-    key64 = key_text_to_uint64(key_text)
-    
-    keys = generate_keys(key64)
+class DESCipher:
+    def __init__(self, key64: int):
+        self.key64 = key64
+        self.encrypt_keys = generate_keys(key64)
+        self.decrypt_keys = self.encrypt_keys[::-1]
+
+    def keys(self, mode: str = "encrypt") -> list[int]:
+        return self.decrypt_keys if mode == "decrypt" else self.encrypt_keys
+
+    def encrypt_block(self, block64: int) -> int:
+        return _crypt_block(block64, self.encrypt_keys)
+
+    def decrypt_block(self, block64: int) -> int:
+        return _crypt_block(block64, self.decrypt_keys)
+
+    def process_block(self, block64: int, mode: str = "encrypt") -> int:
+        return _crypt_block(block64, self.keys(mode))
+
+    def process_ecb(self, blocks: Sequence[int], mode: str = "encrypt") -> array:
+        # Пакетный ECB через битсрезовый движок; импорт отложен, так как bitslice сам импортирует des
+        from bitslice import bitslice_ecb
+
+        return bytes_to_uint64_blocks(bitslice_ecb(uint64_blocks_to_bytes(blocks), self, mode))
+
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def get_cipher(key64: int) -> DESCipher:
+    return DESCipher(key64)
+
+
+def _crypt_block_ede(block64: int, stages: tuple[list[int], list[int], list[int]]) -> int:
+    # IP_INV на выходе ступени и IP на входе следующей взаимно уничтожаются:
+    # между ступенями остаётся только обмен половин
+    k1, k2, k3 = stages
+    chunk = _permute64(block64, compile_permutation(IP, 64))
+
+    left = chunk >> 32
+    right = chunk & 0xFFFFFFFF
+
+    for subkey in k1:
+        left, right = right, left ^ feistel_fast(right, subkey)
+    left, right = right, left
+    for subkey in k2:
+        left, right = right, left ^ feistel_fast(right, subkey)
+    left, right = right, left
+    for subkey in k3:
+        left, right = right, left ^ feistel_fast(right, subkey)
+
+    return _permute64((right << 32) | left, compile_permutation(IP_INV, 64))
+
+
+class TripleDESCipher:
+    # 3DES-EDE: C = E_K3(D_K2(E_K1(P))), P = D_K1(E_K2(D_K3(C)))
+    def __init__(self, key1: int, key2: int, key3: int):
+        c1, c2, c3 = get_cipher(key1), get_cipher(key2), get_cipher(key3)
+        self.encrypt_stages = (c1.encrypt_keys, c2.decrypt_keys, c3.encrypt_keys)
+        self.decrypt_stages = (c3.decrypt_keys, c2.encrypt_keys, c1.decrypt_keys)
+
+    def encrypt_block(self, block64: int) -> int:
+        return _crypt_block_ede(block64, self.encrypt_stages)
+
+    def decrypt_block(self, block64: int) -> int:
+        return _crypt_block_ede(block64, self.decrypt_stages)
+
+    def process_block(self, block64: int, mode: str = "encrypt") -> int:
+        return self.decrypt_block(block64) if mode == "decrypt" else self.encrypt_block(block64)
+
+
+def cipher_for_key(key: str | bytes | bytearray | memoryview) -> DESCipher | TripleDESCipher:
+    # Кэш - по неизменяемым байтам ключа: bytearray и memoryview не хэшируются
+    return _cipher_for_bytes(key_to_bytes(key))
+
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def _cipher_for_bytes(key_bytes: bytes) -> DESCipher | TripleDESCipher:
+    parts = [int.from_bytes(key_bytes[i:i + 8], byteorder="big", signed=False) for i in range(0, len(key_bytes), 8)]
+    if len(parts) == 1:
+        return get_cipher(parts[0])
+    if len(parts) == 2:
+        parts.append(parts[0])
+    return TripleDESCipher(*parts)
+
+
+def des_bytes(data: bytes, key: str | bytes, mode: str = "encrypt", block_mode: str = "ECB",
+              progress: Callable[[int, int], None] | None = None, workers: int | None = None) -> bytes:
+    cipher = cipher_for_key(key)
 
     if mode == "encrypt":
-        data = base64.b64encode(plaintext.encode("utf-8"))
+        blocks = bytes_to_uint64_blocks(pkcs7_pad(data))
+    elif len(data) % 8 != 0:
+        raise ValueError(f"Длина шифртекста должна быть кратна 8 байтам, сейчас {len(data)} байт")
     else:
-        try:
-            data = base64.b64decode(plaintext.encode("ascii"))
-        except:
-            raise ValueError(
-                f"Введенный текст не является корректной Base64 строкой"
-            )
+        blocks = bytes_to_uint64_blocks(data)
+
+    # В режимах CBC и CTR первый блок шифртекста - вектор инициализации (начальное значение счётчика)
+    iv = 0
+    if block_mode != "ECB":
+        if mode == "encrypt":
+            iv = secrets.randbits(64)
+        elif not blocks:
+            raise ValueError("Шифртекст не содержит вектора инициализации")
+        else:
+            iv, blocks = blocks[0], blocks[1:]
+
+    processed_blocks = process_blocks(cipher, blocks, mode, block_mode, iv, workers, progress)
+    if block_mode != "ECB" and mode == "encrypt":
+        processed_blocks.insert(0, iv)
 
-    blocks = bytes_to_uint64_blocks(data)
+    result_bytes = uint64_blocks_to_bytes(processed_blocks)
+    if mode == "encrypt":
+        return result_bytes
+    return pkcs7_unpad(result_bytes)
 
-    processed_blocks: list[int] = []
-    for block in blocks:
-        processed_block = process_block(block, keys, mode)
-        processed_blocks.append(processed_block)
 
-    result_bytes = uint64_blocks_to_bytes(processed_blocks)
-    
+def des(plaintext: str, key_text: str, mode: str = "encrypt",
+        progress: Callable[[int, int], None] | None = None,
+        block_mode: str = "ECB", workers: int | None = None) -> str:
     if mode == "encrypt":
+        result_bytes = des_bytes(plaintext.encode("utf-8"), key_text, mode, block_mode, progress, workers)
         return base64.b64encode(result_bytes).decode("ascii")
-    else:
-        return base64.b64decode(result_bytes).decode("utf-8", errors="replace")
\ No newline at end of file
+
+    try:
+        # Пробелы и переносы строк из вставленного текста не являются частью Base64
+        data = base64.b64decode("".join(plaintext.split()).encode("ascii"), validate=True)
+    except ValueError:
+        raise ValueError(
+            f"Введенный текст не является корректной Base64 строкой"
+        )
+    return des_bytes(data, key_text, mode, block_mode, progress, workers).decode("utf-8", errors="replace")
@@ -0,0 +1,296 @@
+import argparse
+import base64
+import binascii
+import json
+import math
+import os
+import string
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import product
+from typing import Callable, NamedTuple
+
+from des import bytes_to_uint64_blocks, generate_keys, pkcs7_pad, process_block_fast
+
+DEFAULT_ALPHABET = string.ascii_letters + string.digits
+UNKNOWN = "?"
+DEFAULT_CHUNK_SIZE = 1 << 14
+CHECKPOINT_INTERVAL = 10.0
+TASKS_PER_WORKER = 4
+
+
+class SearchTask(NamedTuple):
+    # Для каждой из 8 позиций ключа - группы допустимых байт, различающихся только битом чётности
+    positions: tuple[tuple[bytes, ...], ...]
+    # Пары (открытый блок, шифрблок) для ECB; первая пара используется для раннего отсева
+    pairs: tuple[tuple[int, int], ...]
+
+    @property
+    def size(self) -> int:
+        return math.prod(len(groups) for groups in self.positions)
+
+
+def parse_positions(mask: str, alphabet: str) -> tuple[tuple[bytes, ...], ...]:
+    # Младший бит каждого байта ключа DES не используется, поэтому символы, отличающиеся только им,
+    # дают один и тот же ключ и перебираются один раз
+    if any(len(char.encode("utf-8")) != 1 for char in alphabet):
+        raise ValueError("Алфавит ключа должен состоять из однобайтовых символов (ASCII)")
+    groups: dict[int, bytes] = {}
+    for char in dict.fromkeys(alphabet):
+        groups[ord(char) & 0xFE] = groups.get(ord(char) & 0xFE, b"") + char.encode("ascii")
+    unknown = tuple(groups.values())
+
+    positions: list[tuple[bytes, ...]] = []
+    for char in mask:
+        if char == UNKNOWN:
+            positions.append(unknown)
+        else:
+            # Многобайтовый символ занимает несколько позиций ключа, по одному байту на каждую
+            positions.extend((bytes([byte]),) for byte in char.encode("utf-8"))
+    if len(positions) != 8:
+        raise ValueError(f"Маска должна задавать ровно 8 байт ключа, сейчас {len(positions)}")
+    if not unknown and UNKNOWN in mask:
+        raise ValueError("Алфавит ключа пуст")
+    return tuple(positions)
+
+
+def known_pairs(plaintext: bytes, ciphertext: bytes, block_mode: str = "ECB",
+                complete: bool = False) -> tuple[tuple[int, int], ...]:
+    if len(ciphertext) % 8:
+        raise ValueError("Длина шифртекста должна быть кратна 8 байтам")
+    cipher_blocks = list(bytes_to_uint64_blocks(ciphertext))
+    iv = 0
+    if block_mode != "ECB":
+        if not cipher_blocks:
+            raise ValueError("Шифртекст не содержит вектора инициализации")
+        iv, cipher_blocks = cipher_blocks[0], cipher_blocks[1:]
+
+    # Последний блок с дополнением PKCS#7 учитывается, только если открытый текст известен целиком:
+    # по длине начало сообщения не отличить от всего сообщения
+    if complete:
+        plaintext = pkcs7_pad(plaintext)
+        if len(plaintext) != 8 * len(cipher_blocks):
+            raise ValueError("Длина открытого текста не соответствует длине шифртекста")
+    plain_blocks = list(bytes_to_uint64_blocks(plaintext[:len(plaintext) - len(plaintext) % 8]))
+    plain_blocks = plain_blocks[:len(cipher_blocks)]
+    if not plain_blocks:
+        raise ValueError("Нужен хотя бы один полный блок (8 байт) известного открытого текста")
+
+    # Все режимы сводятся к парам вход/выход блочного шифра
+    pairs = []
+    for i, (plain, cipher) in enumerate(zip(plain_blocks, cipher_blocks)):
+        if block_mode == "CBC":
+            pairs.append((plain ^ (cipher_blocks[i - 1] if i else iv), cipher))
+        elif block_mode == "CTR":
+            pairs.append(((iv + i) & 0xFFFFFFFFFFFFFFFF, plain ^ cipher))
+        else:
+            pairs.append((plain, cipher))
+    return tuple(pairs)
+
+
+def _schedule_tables(positions: tuple[tuple[bytes, ...], ...]) -> list[list[tuple[int, ...]]]:
+    # PC1, сдвиги и PC2 - перестановки бит, поэтому расписание ключа - XOR вкладов отдельных байт
+    return [
+        [tuple(generate_keys(group[0] << (56 - 8 * pos))) for group in groups]
+        for pos, groups in enumerate(positions)
+    ]
+
+
+_worker_task: SearchTask | None = None
+_worker_tables: list[list[tuple[int, ...]]] = []
+
+
+def _init_worker(task: SearchTask) -> None:
+    global _worker_task, _worker_tables
+    _worker_task = task
+    _worker_tables = _schedule_tables(task.positions)
+
+
+def _scan(lo: int, hi: int) -> list[int]:
+    tables = _worker_tables
+    (plain0, cipher0), *rest = _worker_task.pairs
+    last_table = tables[-1]
+    last_size = len(last_table)
+
+    found = []
+    index = lo
+    while index < hi:
+        prefix, start = divmod(index, last_size)
+        stop = min(last_size, start + hi - index)
+
+        # Вклад первых семи байт считается один раз на весь внутренний цикл
+        base = [0] * 16
+        for table in reversed(tables[:-1]):
+            prefix, digit = divmod(prefix, len(table))
+            base = [b ^ k for b, k in zip(base, table[digit])]
+
+        for digit in range(start, stop):
+            keys = [b ^ k for b, k in zip(base, last_table[digit])]
+            if process_block_fast(plain0, keys) == cipher0 and all(process_block_fast(p, keys) == c for p, c in rest):
+                found.append(index + digit - start)
+        index += stop - start
+    return found
+
+
+def index_to_keys(index: int, positions: tuple[tuple[bytes, ...], ...]) -> list[str]:
+    groups = []
+    for pos in reversed(positions):
+        index, digit = divmod(index, len(pos))
+        groups.append(pos[digit])
+    # Ключ собирается из байт и только затем декодируется, чтобы многобайтовые символы маски не распались
+    return [bytes(key).decode("utf-8", errors="replace") for key in product(*reversed(groups))]
+
+
+def _fingerprint(task: SearchTask, chunk_size: int) -> dict:
+    return {
+        "positions": [[group.hex() for group in groups] for groups in task.positions],
+        "pairs": [[f"{p:016X}", f"{c:016X}"] for p, c in task.pairs],
+        "chunk_size": chunk_size,
+    }
+
+
+def load_checkpoint(path: str | None, task: SearchTask, chunk_size: int) -> tuple[int, set[int], list[int]]:
+    if path is None or not os.path.exists(path):
+        return 0, set(), []
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("task") != _fingerprint(task, chunk_size):
+        raise ValueError("Файл контрольной точки относится к другой задаче поиска")
+    return state["completed"], set(state["done"]), state["found"]
+
+
+def save_checkpoint(path: str | None, task: SearchTask, chunk_size: int,
+                    completed: int, done: set[int], found: list[int]) -> None:
+    if path is None:
+        return
+    # Запись через временный файл: прерывание не оставит повреждённую контрольную точку
+    state = {
+        "task": _fingerprint(task, chunk_size),
+        "completed": completed,
+        "done": sorted(done),
+        "found": sorted(found),
+    }
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def _report(done: int, total: int, started: float, searched: int) -> None:
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    rate = searched / elapsed
+    eta = (total - done) / rate if rate else math.inf
+    print(
+        f"\r{done}/{total} ({100 * done / total:.2f}%), {rate:,.0f} keys/s, осталось ~{eta:,.0f} с",
+        end="", file=sys.stderr, flush=True,
+    )
+
+
+def search(task: SearchTask, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+           checkpoint: str | None = None,
+           progress: Callable[[int, int, float, int], None] | None = None) -> list[int]:
+    total = task.size
+    chunks = -(-total // chunk_size)
+    # Выполненные порции: все ниже completed и отдельные номера из done
+    completed, done, found = load_checkpoint(checkpoint, task, chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    saved = started
+    searched = 0
+    pending = {}
+    next_chunk = completed
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(task,)) as pool:
+        try:
+            while next_chunk < chunks or pending:
+                while next_chunk < chunks and len(pending) < workers * TASKS_PER_WORKER:
+                    if next_chunk not in done:
+                        lo = next_chunk * chunk_size
+                        hi = min(lo + chunk_size, total)
+                        pending[pool.submit(_scan, lo, hi)] = (next_chunk, hi - lo)
+                    next_chunk += 1
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    chunk, size = pending.pop(future)
+                    found.extend(future.result())
+                    done.add(chunk)
+                    searched += size
+                while completed in done:
+                    done.discard(completed)
+                    completed += 1
+
+                if progress is not None:
+                    progress(min(total, (completed + len(done)) * chunk_size), total, started, searched)
+                if time.perf_counter() - saved >= CHECKPOINT_INTERVAL:
+                    save_checkpoint(checkpoint, task, chunk_size, completed, done, found)
+                    saved = time.perf_counter()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            save_checkpoint(checkpoint, task, chunk_size, completed, done, found)
+            raise
+
+    save_checkpoint(checkpoint, task, chunk_size, completed, done, found)
+    return sorted(found)
+
+
+def _decode(value: str, encoding: str) -> bytes:
+    if encoding == "hex":
+        return bytes.fromhex(value)
+    if encoding == "base64":
+        return base64.b64decode(value, validate=True)
+    return value.encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Поиск ключа DES по известному открытому тексту в ограниченном пространстве ключей"
+    )
+    parser.add_argument("plaintext", help="известный открытый текст (начало сообщения)")
+    parser.add_argument("ciphertext", help="шифртекст (по умолчанию - Base64, как выводит программа)")
+    parser.add_argument("--plaintext-format", choices=("text", "hex"), default="text")
+    parser.add_argument("--ciphertext-format", choices=("base64", "hex"), default="base64")
+    parser.add_argument("--block-mode", choices=("ECB", "CBC", "CTR"), default="ECB")
+    parser.add_argument("--complete", action="store_true",
+                        help="открытый текст известен целиком (проверяется и последний блок с дополнением)")
+    parser.add_argument("--mask", default=UNKNOWN * 8,
+                        help=f"известная часть ключа, неизвестные символы - '{UNKNOWN}' (например ab{UNKNOWN * 3}xyz)")
+    parser.add_argument("--alphabet", default=DEFAULT_ALPHABET, help="допустимые символы неизвестных позиций")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", default=None, help="JSON-файл для сохранения и продолжения поиска")
+    args = parser.parse_args()
+
+    try:
+        plaintext = _decode(args.plaintext, args.plaintext_format)
+        ciphertext = _decode(args.ciphertext, args.ciphertext_format)
+        task = SearchTask(parse_positions(args.mask, args.alphabet),
+                          known_pairs(plaintext, ciphertext, args.block_mode, args.complete))
+    except (ValueError, binascii.Error) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Пространство ключей: {task.size:,} (без учёта битов чётности)", file=sys.stderr)
+    started = time.perf_counter()
+    try:
+        indices = search(task, args.workers, args.chunk_size, args.checkpoint, _report)
+    except KeyboardInterrupt:
+        print(file=sys.stderr)
+        if args.checkpoint is not None:
+            print(f"Прервано, состояние сохранено в {args.checkpoint}", file=sys.stderr)
+        sys.exit(130)
+    except ValueError as e:
+        print(f"\nОшибка: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(file=sys.stderr)
+    print(f"Найдено ключей: {len(indices)} за {time.perf_counter() - started:.1f} с")
+    for index in indices:
+        keys = index_to_keys(index, task.positions)
+        print(f"ключ {keys[0]!r}" + (f" (эквивалентные: {', '.join(map(repr, keys[1:]))})" if len(keys) > 1 else ""))
+
+
+if __name__ == "__main__":
+    main()
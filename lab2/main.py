@@ -4,7 +4,9 @@ import string
 from PySide6.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile, QIODevice
-from des import des
+from des import KEY_SIZES, des
+from stream import encrypt_file, decrypt_file
+from worker import Job, JobRunner
 
 
 class MainWindow(QMainWindow):
@@ -12,6 +14,7 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.load_ui()
         self.setup_connections()
+        self.jobs = JobRunner(self, [self.ui.showResultBtn, self.ui.loadFileBtn, self.ui.processFileBtn])
         
     def load_ui(self):
         ui_file = QFile("mainwindow.ui")
@@ -35,6 +38,7 @@ class MainWindow(QMainWindow):
         self.ui.loadFileBtn.clicked.connect(self.load_file)
         self.ui.saveFileBtn.clicked.connect(self.save_file)
         self.ui.formKeyBtn.clicked.connect(self.generate_key)
+        self.ui.processFileBtn.clicked.connect(self.process_file)
         self.ui.encryptRadioBtn.setChecked(True)
     
     def generate_key(self):
@@ -58,9 +62,9 @@ class MainWindow(QMainWindow):
         
         try:
             key_bytes = key_text.encode("utf-8")
-            if len(key_bytes) != 8:
+            if len(key_bytes) not in KEY_SIZES:
                 raise ValueError(
-                    f"Ключ DES должен кодироваться в ровно 8 байт (64 бита), "
+                    f"Ключ должен кодироваться в 8 байт (DES), 16 или 24 байта (3DES-EDE), "
                     f"сейчас {len(key_bytes)} байт.\n\n"
                 )
             return key_text
@@ -86,11 +90,55 @@ class MainWindow(QMainWindow):
         is_encrypt = self.ui.encryptRadioBtn.isChecked()
         mode = "encrypt" if is_encrypt else "decrypt"
         
-        try:
-            result = des(input_text, key_text, mode)
-            self.ui.resultText.setPlainText(result)
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при обработке данных:\n{str(e)}")
+        job = Job(des, input_text, key_text, mode, with_progress=True)
+        self.jobs.start(job, self.show_result, self.show_error)
+    
+    def show_result(self, result: str):
+        self.ui.resultText.setPlainText(result)
+    
+    def show_error(self, message: str):
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при обработке данных:\n{message}")
+    
+    def process_file(self):
+        key_text = self.get_key_from_input()
+        if key_text is None:
+            return
+        
+        is_encrypt = self.ui.encryptRadioBtn.isChecked()
+        src, _ = QFileDialog.getOpenFileName(self, "Выберите исходный файл", "", "Все файлы (*)")
+        if not src:
+            return
+        
+        default_dst = src + ".enc" if is_encrypt else src.removesuffix(".enc")
+        dst, _ = QFileDialog.getSaveFileName(self, "Сохранить результат", default_dst, "Все файлы (*)")
+        if not dst:
+            return
+        if dst == src:
+            QMessageBox.warning(self, "Предупреждение", "Файл результата должен отличаться от исходного")
+            return
+        
+        func = encrypt_file if is_encrypt else decrypt_file
+        job = Job(func, src, dst, key_text, with_progress=True)
+        job.signals.progress.connect(self.show_progress)
+        job.signals.cancelled.connect(self.hide_progress)
+        if self.jobs.start(job, self.show_file_result, self.show_file_error):
+            self.ui.progressBar.setValue(0)
+            self.ui.progressBar.setVisible(True)
+            self._file_dst = dst
+    
+    def show_progress(self, done: int, total: int):
+        self.ui.progressBar.setValue(100 * done // total if total > 0 else 100)
+    
+    def hide_progress(self):
+        self.ui.progressBar.setVisible(False)
+    
+    def show_file_result(self, _result):
+        self.hide_progress()
+        QMessageBox.information(self, "Успех", f"Результат сохранён в файл:\n{self._file_dst}")
+    
+    def show_file_error(self, message: str):
+        self.hide_progress()
+        self.show_error(message)
     
     def load_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
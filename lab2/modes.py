@@ -0,0 +1,245 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Protocol, Sequence
+
+BLOCK_MODES = ("ECB", "CBC", "CTR")
+MASK64 = (1 << 64) - 1
+PROGRESS_INTERVAL = 4096
+TASKS_PER_WORKER = 4
+# На меньших объёмах запуск пула процессов дороже самого шифрования
+PARALLEL_MIN_BLOCKS = 1024
+# С этого числа блоков ECB передаётся пакетному методу шифра (process_ecb), если он есть:
+# ниже этого порога построение схем S-блоков для нового ключа не окупается
+BULK_MIN_BLOCKS = 1024
+BULK_BATCH_BLOCKS = 1 << 16
+
+
+class BlockCipher(Protocol):
+    def encrypt_block(self, block64: int) -> int: ...
+
+    def decrypt_block(self, block64: int) -> int: ...
+
+
+Progress = Callable[[int, int], None] | None
+
+
+def _report(progress: Progress, done: int, total: int) -> None:
+    if progress is not None and (done % PROGRESS_INTERVAL == 0 or done == total):
+        progress(done, total)
+
+
+def ecb_process(cipher: BlockCipher, blocks: Sequence[int], mode: str = "encrypt",
+                progress: Progress = None) -> array:
+    bulk = getattr(cipher, "process_ecb", None)
+    if bulk is not None and len(blocks) >= BULK_MIN_BLOCKS:
+        result = array("Q")
+        for start in range(0, len(blocks), BULK_BATCH_BLOCKS):
+            result.extend(bulk(blocks[start:start + BULK_BATCH_BLOCKS], mode))
+            if progress is not None:
+                progress(len(result), len(blocks))
+        return result
+
+    crypt = cipher.decrypt_block if mode == "decrypt" else cipher.encrypt_block
+    result = array("Q")
+    for i, block in enumerate(blocks):
+        result.append(crypt(block))
+        _report(progress, i + 1, len(blocks))
+    return result
+
+
+def cbc_encrypt(cipher: BlockCipher, blocks: Sequence[int], iv: int, progress: Progress = None) -> array:
+    result = array("Q")
+    previous = iv
+    for i, block in enumerate(blocks):
+        previous = cipher.encrypt_block(block ^ previous)
+        result.append(previous)
+        _report(progress, i + 1, len(blocks))
+    return result
+
+
+def cbc_decrypt(cipher: BlockCipher, blocks: Sequence[int], iv: int, progress: Progress = None) -> array:
+    result = array("Q")
+    previous = iv
+    for i, block in enumerate(blocks):
+        result.append(cipher.decrypt_block(block) ^ previous)
+        previous = block
+        _report(progress, i + 1, len(blocks))
+    return result
+
+
+def ctr_process(cipher: BlockCipher, blocks: Sequence[int], counter: int, progress: Progress = None) -> array:
+    result = array("Q")
+    for i, block in enumerate(blocks):
+        result.append(block ^ cipher.encrypt_block((counter + i) & MASK64))
+        _report(progress, i + 1, len(blocks))
+    return result
+
+
+def _ranges(count: int, workers: int) -> list[tuple[int, int]]:
+    step = max(1, -(-count // (workers * TASKS_PER_WORKER)))
+    return [(start, min(start + step, count)) for start in range(0, count, step)]
+
+
+_worker_cipher: BlockCipher | None = None
+_worker_buffers: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _init_worker(cipher: BlockCipher) -> None:
+    # Ключевое расписание передаётся процессу один раз, в задачах - только имена буферов и границы диапазона
+    global _worker_cipher
+    _worker_cipher = cipher
+
+
+def _attach(input_name: str, output_name: str) -> tuple[shared_memory.SharedMemory, shared_memory.SharedMemory]:
+    # Подключение к буферам сохраняется между задачами; после их замены старые отключаются
+    for name in [name for name in _worker_buffers if name not in (input_name, output_name)]:
+        _worker_buffers.pop(name).close()
+    for name in (input_name, output_name):
+        if name not in _worker_buffers:
+            _worker_buffers[name] = shared_memory.SharedMemory(name=name)
+    return _worker_buffers[input_name], _worker_buffers[output_name]
+
+
+def _shared_task(task: Callable, input_name: str, output_name: str, lo: int, hi: int, start_value: Any) -> None:
+    source, target = _attach(input_name, output_name)
+    blocks = array("Q")
+    blocks.frombytes(source.buf[8 * lo:8 * hi])
+    with target.buf.cast("Q") as view:
+        view[lo:hi] = task(_worker_cipher, blocks, start_value)
+
+
+class ParallelPool:
+    # Пул процессов и общие буферы живут, пока обрабатываются все порции одного потока
+    def __init__(self, cipher: BlockCipher, workers: int):
+        self.cipher = cipher
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._source: shared_memory.SharedMemory | None = None
+        self._target: shared_memory.SharedMemory | None = None
+
+    def _buffers(self, size: int) -> tuple[shared_memory.SharedMemory, shared_memory.SharedMemory]:
+        # Буферы пересоздаются только если порция больше всех предыдущих
+        if self._source is None or self._source.size < size:
+            self._release_buffers()
+            self._source = shared_memory.SharedMemory(create=True, size=size)
+            self._target = shared_memory.SharedMemory(create=True, size=size)
+        return self._source, self._target
+
+    def _release_buffers(self) -> None:
+        for memory in (self._source, self._target):
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+        self._source = self._target = None
+
+    def run(self, task: Callable, blocks: Sequence[int], start_value: Callable[[int], Any],
+            progress: Progress = None) -> array:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.cipher,))
+        count = len(blocks)
+        ranges = _ranges(count, self.workers)
+        source, target = self._buffers(8 * count)
+        with source.buf.cast("Q") as view:
+            view[:count] = array("Q", blocks)
+        futures = [
+            self._executor.submit(_shared_task, task, source.name, target.name, lo, hi, start_value(lo))
+            for lo, hi in ranges
+        ]
+        for future, (_, hi) in zip(futures, ranges):
+            future.result()
+            if progress is not None:
+                progress(hi, count)
+        result = array("Q")
+        result.frombytes(target.buf[:8 * count])
+        return result
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._release_buffers()
+
+    def __enter__(self) -> "ParallelPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def ecb_process_parallel(pool: ParallelPool, blocks: Sequence[int], mode: str, progress: Progress = None) -> array:
+    return pool.run(ecb_process, blocks, lambda lo: mode, progress)
+
+
+def cbc_decrypt_parallel(pool: ParallelPool, blocks: Sequence[int], iv: int, progress: Progress = None) -> array:
+    # Каждый открытый блок зависит только от двух соседних блоков шифртекста
+    return pool.run(cbc_decrypt, blocks, lambda lo: blocks[lo - 1] if lo else iv, progress)
+
+
+def ctr_process_parallel(pool: ParallelPool, blocks: Sequence[int], counter: int, progress: Progress = None) -> array:
+    return pool.run(ctr_process, blocks, lambda lo: (counter + lo) & MASK64, progress)
+
+
+class BlockStream:
+    # Режим шифрования с состоянием между порциями блоков: предыдущий блок CBC или значение счётчика CTR
+    def __init__(self, cipher: BlockCipher, mode: str = "encrypt", block_mode: str = "ECB", iv: int = 0,
+                 workers: int | None = None):
+        if block_mode not in BLOCK_MODES:
+            raise ValueError(f"Неизвестный режим шифрования: {block_mode}")
+        self.cipher = cipher
+        self.mode = mode
+        self.block_mode = block_mode
+        self.state = iv
+        self.workers = workers
+        # Процессы запускаются при первой большой порции и используются для всех следующих
+        self._pool = ParallelPool(cipher, workers) if workers is not None and workers > 1 else None
+
+    def process(self, blocks: Sequence[int]) -> array:
+        result = process_blocks(self.cipher, blocks, self.mode, self.block_mode, self.state, self.workers,
+                                pool=self._pool)
+        if not blocks:
+            return result
+        if self.block_mode == "CTR":
+            self.state = (self.state + len(blocks)) & MASK64
+        elif self.block_mode == "CBC":
+            self.state = result[-1] if self.mode == "encrypt" else blocks[-1]
+        return result
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+
+    def __enter__(self) -> "BlockStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def process_blocks(cipher: BlockCipher, blocks: Sequence[int], mode: str = "encrypt", block_mode: str = "ECB",
+                   iv: int = 0, workers: int | None = None, progress: Progress = None,
+                   pool: ParallelPool | None = None) -> array:
+    if block_mode not in BLOCK_MODES:
+        raise ValueError(f"Неизвестный режим шифрования: {block_mode}")
+
+    # Шифрование CBC последовательно по своей природе
+    parallel = (workers is not None and workers > 1 and len(blocks) >= PARALLEL_MIN_BLOCKS
+                and not (block_mode == "CBC" and mode == "encrypt"))
+    if parallel and pool is None:
+        with ParallelPool(cipher, workers) as pool:
+            return process_blocks(cipher, blocks, mode, block_mode, iv, workers, progress, pool)
+
+    if block_mode == "CTR":
+        if parallel:
+            return ctr_process_parallel(pool, blocks, iv, progress)
+        return ctr_process(cipher, blocks, iv, progress)
+    if block_mode == "CBC":
+        if mode == "encrypt":
+            return cbc_encrypt(cipher, blocks, iv, progress)
+        if parallel:
+            return cbc_decrypt_parallel(pool, blocks, iv, progress)
+        return cbc_decrypt(cipher, blocks, iv, progress)
+    if parallel:
+        return ecb_process_parallel(pool, blocks, mode, progress)
+    return ecb_process(cipher, blocks, mode, progress)
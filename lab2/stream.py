@@ -0,0 +1,84 @@
+import os
+import secrets
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterator
+
+from des import bytes_to_uint64_blocks, cipher_for_key, pkcs7_pad, pkcs7_unpad, uint64_blocks_to_bytes
+from modes import BlockStream
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _chunk_size(chunk_size: int) -> int:
+    if chunk_size < 8:
+        raise ValueError("Размер порции должен быть не меньше 8 байт")
+    return chunk_size - chunk_size % 8
+
+
+@contextmanager
+def _replace_on_success(dst: str) -> Iterator[BinaryIO]:
+    # Результат пишется во временный файл рядом с dst и заменяет его только после успешного завершения;
+    # при ошибке или отмене удаляется только временный файл, существующий dst не трогается
+    tmp = f"{dst}.{secrets.token_hex(4)}.tmp"
+    writer = os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), "wb")
+    try:
+        with writer:
+            yield writer
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def encrypt_file(src: str, dst: str, key: str | bytes, block_mode: str = "ECB",
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, progress: Callable[[int, int], None] | None = None,
+                 workers: int | None = None) -> None:
+    chunk_size = _chunk_size(chunk_size)
+    iv = secrets.randbits(64) if block_mode != "ECB" else 0
+    total = os.path.getsize(src)
+    done = 0
+
+    with BlockStream(cipher_for_key(key), "encrypt", block_mode, iv, workers) as stream, \
+            open(src, "rb") as reader, _replace_on_success(dst) as writer:
+        if block_mode != "ECB":
+            writer.write(iv.to_bytes(8, "big"))
+        while True:
+            chunk = reader.read(chunk_size)
+            done += len(chunk)
+            last = len(chunk) < chunk_size
+            if last:
+                chunk = pkcs7_pad(chunk)
+            writer.write(uint64_blocks_to_bytes(stream.process(bytes_to_uint64_blocks(chunk))))
+            if progress is not None:
+                progress(done, total)
+            if last:
+                return
+
+
+def decrypt_file(src: str, dst: str, key: str | bytes, block_mode: str = "ECB",
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, progress: Callable[[int, int], None] | None = None,
+                 workers: int | None = None) -> None:
+    chunk_size = _chunk_size(chunk_size)
+    cipher = cipher_for_key(key)
+    total = os.path.getsize(src)
+    if total % 8:
+        raise ValueError("Размер зашифрованного файла должен быть кратен 8 байтам")
+    if block_mode != "ECB" and total < 8:
+        raise ValueError("Файл не содержит вектора инициализации")
+
+    with open(src, "rb") as reader:
+        iv = int.from_bytes(reader.read(8), "big") if block_mode != "ECB" else 0
+        done = 8 if block_mode != "ECB" else 0
+        with BlockStream(cipher, "decrypt", block_mode, iv, workers) as stream, _replace_on_success(dst) as writer:
+            # Последний блок придерживается до конца файла: в нём дополнение PKCS#7
+            pending = b""
+            while chunk := reader.read(chunk_size):
+                done += len(chunk)
+                plain = pending + uint64_blocks_to_bytes(stream.process(bytes_to_uint64_blocks(chunk)))
+                writer.write(plain[:-8])
+                pending = plain[-8:]
+                if progress is not None:
+                    progress(done, total)
+
+            writer.write(pkcs7_unpad(pending))
@@ -8,7 +8,11 @@ from PySide6.QtWidgets import (
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile, QIODevice
 
-from rsa import generate_keys, encrypt_text, decrypt_text
+from keypool import KeyPool
+from rsa import PrivateKey, encrypt_text, decrypt_text
+from worker import Job, JobRunner
+
+KEY_BITS = 512
 
 
 class MainWindow(QMainWindow):
@@ -16,6 +20,18 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.load_ui()
         self.setup_connections()
+        self.generated_key: PrivateKey | None = None
+        # Пары ключей генерируются заранее в фоновых процессах; spawn, а не fork - иначе копировался бы процесс с Qt
+        self.key_pool = KeyPool((KEY_BITS,), context="spawn")
+        self.key_pool.start()
+        self.jobs = JobRunner(
+            self,
+            [self.ui.generateKeysBtn, self.ui.showResultBtn, self.ui.loadFileBtn],
+        )
+
+    def closeEvent(self, event):
+        self.key_pool.close()
+        super().closeEvent(event)
 
     def load_ui(self):
         ui_file = QFile("mainwindow.ui")
@@ -58,19 +74,22 @@ class MainWindow(QMainWindow):
         return value
 
     def generate_keys_clicked(self):
-        try:
-            public_key, private_key = generate_keys(512)
-            e, n = public_key
-            d, _ = private_key
-            self.ui.eValueLineEdit.setText(str(e))
-            self.ui.dValueLineEdit.setText(str(d))
-            self.ui.nValueLineEdit.setText(str(n))
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Ошибка генерации ключей",
-                f"Не удалось сформировать ключи:\n{str(e)}",
-            )
+        self.jobs.start(Job(self.key_pool.get, KEY_BITS), self.show_keys, self.show_keys_error)
+
+    def show_keys(self, keys):
+        public_key, private_key = keys
+        e, n = public_key
+        self.generated_key = private_key
+        self.ui.eValueLineEdit.setText(str(e))
+        self.ui.dValueLineEdit.setText(str(private_key.d))
+        self.ui.nValueLineEdit.setText(str(n))
+
+    def show_keys_error(self, message: str):
+        QMessageBox.critical(
+            self,
+            "Ошибка генерации ключей",
+            f"Не удалось сформировать ключи:\n{message}",
+        )
 
     def process_action(self):
         input_text = self.ui.inputTextEdit.toPlainText()
@@ -89,22 +108,35 @@ class MainWindow(QMainWindow):
                 e_value = self._get_int_from_line_edit(
                     self.ui.eValueLineEdit, "e"
                 )
-                result = encrypt_text(input_text, e_value, n)
+                job = Job(encrypt_text, input_text, e_value, n)
             else:
                 d_value = self._get_int_from_line_edit(
                     self.ui.dValueLineEdit, "d"
                 )
-                result = decrypt_text(input_text, d_value, n)
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Ошибка обработки",
-                f"Произошла ошибка при обработке данных:\n{str(e)}",
-            )
+                job = Job(decrypt_text, input_text, self._private_key(d_value, n))
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка ключа", str(e))
             return
 
+        self.jobs.start(job, self.show_result, self.show_error)
+
+    def _private_key(self, d: int, n: int) -> PrivateKey:
+        # Пока в полях сгенерированный ключ, расшифрование идёт через p и q (по КТО)
+        key = self.generated_key
+        if key is not None and key.d == d and key.n == n:
+            return key
+        return PrivateKey(d, n)
+
+    def show_result(self, result: str):
         self.ui.resultTextEdit.setPlainText(result)
 
+    def show_error(self, message: str):
+        QMessageBox.critical(
+            self,
+            "Ошибка обработки",
+            f"Произошла ошибка при обработке данных:\n{message}",
+        )
+
     def load_from_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
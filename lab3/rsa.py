@@ -1,14 +1,137 @@
 import base64
+import secrets
+from math import gcd
+from operator import itemgetter
 from typing import Tuple
-from sympy import randprime, gcd, mod_inverse
 
-def _generate_prime(bits: int) -> int:
-    return randprime(2**(bits - 1), 2**bits)
+SMALL_PRIME_LIMIT = 2000
+# Число нечётных кандидатов p0, p0 + 2, ..., просеиваемых за один раз
+SIEVE_WINDOW = 4096
+
+
+class PrivateKey(tuple):
+    # Распаковывается как пара (d, n): d, n = private_key.
+    # p, q, dp, dq, qinv - параметры ускорения по китайской теореме об остатках; 0 - не заданы
+    d = property(itemgetter(0))
+    n = property(itemgetter(1))
+
+    def __new__(cls, d: int, n: int, p: int = 0, q: int = 0, dp: int = 0, dq: int = 0, qinv: int = 0):
+        key = super().__new__(cls, (d, n))
+        key.p, key.q, key.dp, key.dq, key.qinv = p, q, dp, dq, qinv
+        return key
+
+    def __getnewargs__(self) -> tuple[int, ...]:
+        return self.d, self.n, self.p, self.q, self.dp, self.dq, self.qinv
+
+    def __repr__(self) -> str:
+        return f"PrivateKey(d={self.d}, n={self.n}, p={self.p}, q={self.q})"
+
+
+def make_private_key(d: int, n: int, p: int = 0, q: int = 0) -> PrivateKey:
+    if not p or not q:
+        return PrivateKey(d, n)
+    if p * q != n:
+        raise ValueError("Множители p и q не соответствуют модулю n")
+    return PrivateKey(d, n, p, q, d % (p - 1), d % (q - 1), pow(q, -1, p))
+
+
+def private_power(value: int, key: PrivateKey) -> int:
+    # При множителе 2 показатель по нему равен 0, а pow(0, 0, 2) == 1 - для таких ключей CRT неприменима
+    if not key.p or min(key.p, key.q) == 2:
+        return pow(value, key.d, key.n)
+    # Формула Гарнера: две экспоненты по модулям вдвое меньшей длины вместо одной полной
+    m1 = pow(value % key.p, key.dp, key.p)
+    m2 = pow(value % key.q, key.dq, key.q)
+    h = key.qinv * (m1 - m2) % key.p
+    return m2 + h * key.q
+
+
+def _small_primes(limit: int) -> tuple[int, ...]:
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return tuple(i for i in range(3, limit) if sieve[i])
+
+
+_SMALL_PRIMES = _small_primes(SMALL_PRIME_LIMIT)
+
+
+def _miller_rabin_rounds(bits: int) -> int:
+    # Вероятность ошибки не выше 2**-80 для случайных кандидатов (HAC, табл. 4.4)
+    for min_bits, rounds in (
+        (1300, 2), (850, 3), (650, 4), (550, 5), (450, 6), (400, 7), (350, 8), (300, 9), (250, 12),
+    ):
+        if bits >= min_bits:
+            return rounds
+    return 40
+
+
+def is_probable_prime(n: int, rounds: int | None = None) -> bool:
+    if n < 2:
+        return False
+    for p in _SMALL_PRIMES[:50]:
+        if n % p == 0:
+            return n == p
+    if n % 2 == 0:
+        return n == 2
+    if rounds is None:
+        rounds = _miller_rabin_rounds(n.bit_length())
+
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for _ in range(rounds):
+        x = pow(secrets.randbelow(n - 3) + 2, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
 
 
-def generate_keys(bits: int = 512) -> Tuple[Tuple[int, int], Tuple[int, int]]:
-    p = _generate_prime(bits)
-    q = _generate_prime(bits)
+def _generate_prime(bits: int) -> int:
+    if 1 << bits <= SMALL_PRIME_LIMIT:
+        # Все простые такой длины есть в таблице малых простых, просеивать нечего
+        return secrets.choice([p for p in (2,) + _SMALL_PRIMES if p.bit_length() == bits])
+    rounds = _miller_rabin_rounds(bits)
+    while True:
+        # Два старших бита установлены, чтобы произведение двух простых имело ровно 2 * bits бит
+        start = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        # sieve[i] - кандидат start + 2i не делится ни на одно малое простое
+        sieve = bytearray([1]) * SIEVE_WINDOW
+        for p in _SMALL_PRIMES:
+            # Малое простое не вычёркивает само себя: делители берутся только меньше кандидатов
+            if p >= start:
+                break
+            first = (-start * ((p + 1) // 2)) % p
+            sieve[first::p] = bytes(len(range(first, SIEVE_WINDOW, p)))
+        for i in range(SIEVE_WINDOW):
+            candidate = start + 2 * i
+            if sieve[i] and candidate.bit_length() == bits and is_probable_prime(candidate, rounds):
+                return candidate
+
+
+def _generate_primes(bits: int, parallel: bool) -> tuple[int, int]:
+    if not parallel:
+        return _generate_prime(bits), _generate_prime(bits)
+    # Пул процессов импортируется только здесь: модуль должен загружаться быстро
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        p, q = pool.map(_generate_prime, (bits, bits))
+    return p, q
+
+
+def generate_keys(bits: int = 512, parallel: bool = False) -> Tuple[Tuple[int, int], PrivateKey]:
+    if bits < 2:
+        raise ValueError("Размер простых чисел должен быть не меньше 2 бит")
+    p, q = _generate_primes(bits, parallel)
     while q == p:
         q = _generate_prime(bits)
 
@@ -23,8 +146,8 @@ def generate_keys(bits: int = 512) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         if gcd(e, phi) != 1:
             raise ValueError("Не удалось подобрать открытый показатель e")
 
-    d = mod_inverse(e, phi)
-    return (e, n), (d, n)
+    d = pow(e, -1, phi)
+    return (e, n), make_private_key(d, n, p, q)
 
 
 def _max_block_size(n: int) -> int:
@@ -55,11 +178,13 @@ def encrypt_text(plaintext: str, e: int, n: int) -> str:
     return base64.b64encode(cipher_bytes).decode("utf-8")
 
 
-def decrypt_text(ciphertext: str, d: int, n: int) -> str:
+def decrypt_text(ciphertext: str, d: int | PrivateKey, n: int | None = None) -> str:
+    key = d if isinstance(d, PrivateKey) else PrivateKey(d, n)
     if not ciphertext.strip():
         return ""
-    if n <= 0 or d <= 0:
+    if key.n <= 0 or key.d <= 0:
         raise ValueError("Некорректные значения ключа")
+    n = key.n
 
     try:
         cipher_bytes = base64.b64decode(ciphertext)
@@ -72,7 +197,7 @@ def decrypt_text(ciphertext: str, d: int, n: int) -> str:
     for i in range(0, len(cipher_bytes), block_len):
         chunk = cipher_bytes[i:i + block_len]
         c = int.from_bytes(chunk, "big")
-        m = pow(c, d, n)
+        m = private_power(c, key)
 
         if m == 0:
             m_bytes = b'\x00'
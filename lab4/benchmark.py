@@ -0,0 +1,60 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = ("rsa",)
+DEFAULT_TARGET_MS = 50.0
+DEFAULT_REPEAT = 10
+
+# Импорт замеряется в отдельном интерпретаторе, чтобы кэш модулей не искажал результат
+_IMPORT_SNIPPET = (
+    "import importlib, time\n"
+    "started = time.perf_counter()\n"
+    "importlib.import_module({module!r})\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+
+def measure_import(module: str, repeat: int = DEFAULT_REPEAT) -> list[float]:
+    here = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SNIPPET.format(module=module)],
+            cwd=here, capture_output=True, text=True, check=True,
+        )
+        timings.append(float(result.stdout) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер времени импорта модулей при запуске")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS,
+                        help="допустимая медиана времени импорта, мс")
+    args = parser.parse_args()
+
+    failed = []
+    print("модуль        мин, мс   медиана, мс")
+    for module in args.modules:
+        try:
+            timings = measure_import(module, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{module}: ошибка импорта\n{e.stderr}", file=sys.stderr)
+            failed.append(module)
+            continue
+        median = statistics.median(timings)
+        print(f"{module:<12} {min(timings):>8.1f}  {median:>12.1f}")
+        if median > args.target_ms:
+            failed.append(module)
+
+    if failed:
+        print(f"Превышено {args.target_ms:.0f} мс или ошибка: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
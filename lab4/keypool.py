@@ -0,0 +1,165 @@
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Tuple
+
+from rsa import PrivateKey, generate_keys, make_private_key
+
+DEFAULT_BITS = 512
+DEFAULT_CAPACITY = 4
+
+KeyPair = Tuple[Tuple[int, int], PrivateKey]
+
+
+def _key_to_json(bits: int, keys: KeyPair) -> dict:
+    (e, n), private_key = keys
+    return {"bits": bits, "e": e, "d": private_key.d, "p": private_key.p, "q": private_key.q}
+
+
+def _key_from_json(item: dict) -> tuple[int, KeyPair]:
+    n = item["p"] * item["q"]
+    return item["bits"], ((item["e"], n), make_private_key(item["d"], n, item["p"], item["q"]))
+
+
+class KeyPool:
+    # Запас готовых пар ключей для каждого размера; недостающие пары генерируются процессами в фоне
+    def __init__(self, sizes: Iterable[int] = (DEFAULT_BITS,), capacity: int = DEFAULT_CAPACITY,
+                 workers: int | None = None, path: str | None = None, context: str | None = None):
+        self.capacity = capacity
+        self.workers = workers
+        self.path = path
+        # Способ запуска процессов (fork, spawn, forkserver); None - по умолчанию для платформы
+        self.context = context
+        self._keys: dict[int, deque[KeyPair]] = {bits: deque() for bits in sizes}
+        self._pending: dict[int, int] = {bits: 0 for bits in self._keys}
+        self._ready = threading.Condition()
+        self._executor: ProcessPoolExecutor | None = None
+        self._closed = False
+
+    def start(self) -> None:
+        self.load()
+        with self._ready:
+            if self._executor is None:
+                # Пул поддерживает не больше capacity генераций на размер - лишние процессы не нужны
+                workers = min(self.workers or os.cpu_count() or 1, self.capacity * len(self._keys))
+                self._executor = ProcessPoolExecutor(max_workers=max(1, workers),
+                                                     mp_context=multiprocessing.get_context(self.context))
+            for bits in list(self._keys):
+                self._refill(bits)
+
+    def available(self, bits: int) -> int:
+        with self._ready:
+            return len(self._keys.get(bits, ()))
+
+    def wait_full(self) -> None:
+        with self._ready:
+            while any(self._pending.values()):
+                self._ready.wait()
+
+    def _refill(self, bits: int) -> None:
+        keys = self._keys.setdefault(bits, deque())
+        self._pending.setdefault(bits, 0)
+        if self._executor is None or self._closed:
+            return
+        while len(keys) + self._pending[bits] < self.capacity:
+            self._pending[bits] += 1
+            future = self._executor.submit(generate_keys, bits)
+            future.add_done_callback(lambda done, bits=bits: self._on_generated(bits, done))
+
+    def _on_generated(self, bits: int, future: Future) -> None:
+        with self._ready:
+            self._pending[bits] -= 1
+            if not future.cancelled() and future.exception() is None and not self._closed:
+                self._keys[bits].append(future.result())
+            self._ready.notify_all()
+
+    def get(self, bits: int = DEFAULT_BITS) -> KeyPair:
+        # Без готовой пары ждём ближайшую из генерируемых; если пул не запущен - генерируем сами
+        with self._ready:
+            self._refill(bits)
+            keys = self._keys[bits]
+            while not keys and self._pending[bits]:
+                self._ready.wait()
+            pair = keys.popleft() if keys else None
+            self._refill(bits)
+        # Выданная пара сразу удаляется и из файла, чтобы не попасть к кому-то ещё после сбоя
+        self.save()
+        return pair if pair is not None else generate_keys(bits)
+
+    def take(self, bits: int, count: int) -> list[KeyPair]:
+        # Для пакетных задач: готовые пары из запаса, остальные генерируются параллельно сверх ёмкости пула
+        with self._ready:
+            keys = self._keys.setdefault(bits, deque())
+            result = [keys.popleft() for _ in range(min(count, len(keys)))]
+            executor = None if self._closed else self._executor
+        missing = count - len(result)
+        if executor is None:
+            result.extend(generate_keys(bits) for _ in range(missing))
+        else:
+            futures = [executor.submit(generate_keys, bits) for _ in range(missing)]
+            result.extend(future.result() for future in futures)
+        with self._ready:
+            self._refill(bits)
+        self.save()
+        return result
+
+    def load(self) -> None:
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+            loaded = [_key_from_json(item) for item in items]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Пул - только запас: повреждённый файл не мешает работе, ключи сгенерируются заново
+            return
+        with self._ready:
+            for bits, pair in loaded:
+                self._keys.setdefault(bits, deque()).append(pair)
+                self._pending.setdefault(bits, 0)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._ready:
+            items = [_key_to_json(bits, pair) for bits, keys in self._keys.items() for pair in keys]
+        # Файл содержит закрытые ключи, поэтому доступен только владельцу
+        fd = os.open(self.path + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(items, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def close(self) -> None:
+        with self._ready:
+            self._closed = True
+            executor, self._executor = self._executor, None
+            self._ready.notify_all()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.save()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Заполнение файла пула заранее сгенерированных ключей RSA")
+    parser.add_argument("path", help="JSON-файл пула")
+    parser.add_argument("--bits", type=int, nargs="+", default=[DEFAULT_BITS])
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="число пар ключей каждого размера")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    pool = KeyPool(args.bits, args.capacity, args.workers, args.path)
+    pool.start()
+    try:
+        pool.wait_full()
+    finally:
+        pool.close()
+    for bits in args.bits:
+        print(f"{bits} бит: {pool.available(bits)} пар ключей")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,12 @@ from PySide6.QtCore import QFile, QIODevice
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtWidgets import QApplication, QFileDialog, QMainWindow, QMessageBox
 
-from rsa import generate_keys
+from keypool import KeyPool
+from rsa import PrivateKey, make_private_key
 from signature import sign_file, verify_file
+from worker import Job, JobRunner
+
+KEY_BITS = 512
 
 
 class MainWindow(QMainWindow):
@@ -15,6 +19,18 @@ class MainWindow(QMainWindow):
         super().__init__()
         self._load_ui()
         self._connect()
+        self._generated_key: PrivateKey | None = None
+        # Пары ключей генерируются заранее в фоновых процессах; spawn, а не fork - иначе копировался бы процесс с Qt
+        self._key_pool = KeyPool((KEY_BITS,), context="spawn")
+        self._key_pool.start()
+        self._jobs = JobRunner(
+            self,
+            [self.ui.generateKeysBtn, self.ui.signFileBtn, self.ui.verifyBtn],
+        )
+
+    def closeEvent(self, event) -> None:
+        self._key_pool.close()
+        super().closeEvent(event)
 
     def _load_ui(self) -> None:
         ui_file = QFile("mainwindow.ui")
@@ -47,7 +63,7 @@ class MainWindow(QMainWindow):
         self.ui.verifyBtn.clicked.connect(self._verify)
     
     def load_key_values(self, path: str) -> dict[str, int]:
-        _KEY_LINE_RE = re.compile(r"^\s*([ned])\s*=\s*([0-9]+)\s*$", re.IGNORECASE)
+        _KEY_LINE_RE = re.compile(r"^\s*(n|e|d|p|q|dp|dq|qinv)\s*=\s*([0-9]+)\s*$", re.IGNORECASE)
         values: dict[str, int] = {}
         with open(path, "r", encoding="utf-8") as f:
             for line in f:
@@ -67,11 +83,16 @@ class MainWindow(QMainWindow):
         return values["n"], values["e"]
 
 
-    def load_private_key(self, path: str) -> tuple[int, int]:
+    def load_private_key(self, path: str) -> PrivateKey:
         values = self.load_key_values(path)
         if "n" not in values or "d" not in values:
             raise ValueError("Некорректный формат закрытого ключа (нужны n и d)")
-        return values["n"], values["d"]
+        # Ключи старого формата содержат только n и d и подписываются без ускорения по КТО
+        key = make_private_key(values["d"], values["n"], values.get("p", 0), values.get("q", 0))
+        for name in ("dp", "dq", "qinv"):
+            if name in values and key.p and values[name] != getattr(key, name):
+                raise ValueError(f"Параметр {name} закрытого ключа не соответствует p, q и d")
+        return key
 
 
     def save_public_key(self, path: str, n: int, e: int) -> None:
@@ -80,21 +101,34 @@ class MainWindow(QMainWindow):
             f.write(f"e={e}\n")
 
 
-    def save_private_key(self, path: str, n: int, d: int) -> None:
+    def save_private_key(self, path: str, key: PrivateKey) -> None:
         with open(path, "w", encoding="utf-8") as f:
-            f.write(f"n={n}\n")
-            f.write(f"d={d}\n")
+            f.write(f"n={key.n}\n")
+            f.write(f"d={key.d}\n")
+            if key.p:
+                for name in ("p", "q", "dp", "dq", "qinv"):
+                    f.write(f"{name}={getattr(key, name)}\n")
+
+    def _private_key(self, n: int, d: int) -> PrivateKey:
+        # Множители p и q известны, только пока в полях сгенерированный ключ
+        key = self._generated_key
+        if key is not None and key.n == n and key.d == d:
+            return key
+        return PrivateKey(d, n)
 
     def _generate_keys(self) -> None:
-        try:
-            public_key, private_key = generate_keys()
-            e, n = public_key
-            d, _ = private_key
-            self.ui.nLineEdit.setText(str(n))
-            self.ui.eLineEdit.setText(str(e))
-            self.ui.dLineEdit.setText(str(d))
-        except Exception as exc:
-            QMessageBox.critical(self, "Ошибка генерации ключей", str(exc))
+        self._jobs.start(Job(self._key_pool.get, KEY_BITS), self._show_keys, self._show_keys_error)
+
+    def _show_keys(self, keys) -> None:
+        public_key, private_key = keys
+        e, n = public_key
+        self._generated_key = private_key
+        self.ui.nLineEdit.setText(str(n))
+        self.ui.eLineEdit.setText(str(e))
+        self.ui.dLineEdit.setText(str(private_key.d))
+
+    def _show_keys_error(self, message: str) -> None:
+        QMessageBox.critical(self, "Ошибка генерации ключей", message)
 
     def _save_public_key_clicked(self) -> None:
         n = self.ui.nLineEdit.text().strip()
@@ -133,7 +167,7 @@ class MainWindow(QMainWindow):
         if not path:
             return
         try:
-            self.save_private_key(path, int(n), int(d))
+            self.save_private_key(path, self._private_key(int(n), int(d)))
             QMessageBox.information(self, "Готово", f"Закрытый ключ сохранён:\n{path}")
         except Exception as exc:
             QMessageBox.critical(self, "Ошибка", str(exc))
@@ -169,11 +203,20 @@ class MainWindow(QMainWindow):
         sig_path = file_path + ".sig"
 
         try:
-            n, d = self.load_private_key(key_path)
-            sign_file(file_path, sig_path, n, d)
-            QMessageBox.information(self, "Готово", f"Подпись создана:\n{sig_path}")
+            key = self.load_private_key(key_path)
         except Exception as exc:
             QMessageBox.critical(self, "Ошибка подписи", str(exc))
+            return
+
+        job = Job(sign_file, file_path, sig_path, key.n, key, with_progress=True)
+        if self._jobs.start(job, self._show_signed, self._show_sign_error):
+            self._sig_path = sig_path
+
+    def _show_signed(self, _result) -> None:
+        QMessageBox.information(self, "Готово", f"Подпись создана:\n{self._sig_path}")
+
+    def _show_sign_error(self, message: str) -> None:
+        QMessageBox.critical(self, "Ошибка подписи", message)
 
     def _choose_verify_file(self) -> None:
         path, _ = QFileDialog.getOpenFileName(self, "Выбрать исходный файл", "", "All files (*)")
@@ -224,12 +267,18 @@ class MainWindow(QMainWindow):
 
         try:
             n, e = self.load_public_key(key_path)
-            ok = verify_file(file_path, sig_path, n, e)
         except Exception as exc:
-            self.ui.verifyResultLabel.setText("Результат: ошибка")
-            QMessageBox.critical(self, "Ошибка проверки", str(exc))
+            self._show_verify_error(str(exc))
             return
 
+        job = Job(verify_file, file_path, sig_path, n, e, with_progress=True)
+        self._jobs.start(job, self._show_verify_result, self._show_verify_error)
+
+    def _show_verify_error(self, message: str) -> None:
+        self.ui.verifyResultLabel.setText("Результат: ошибка")
+        QMessageBox.critical(self, "Ошибка проверки", message)
+
+    def _show_verify_result(self, ok: bool) -> None:
         if ok:
             self.ui.verifyResultLabel.setText("Результат: подпись корректна")
             QMessageBox.information(self, "Проверка", "Подпись корректна.")
@@ -1,28 +1,48 @@
 import base64
 import hashlib
 import math
+import os
+from typing import Callable
 
+from rsa import PrivateKey, private_power
 
-def hash_file(path: str) -> int:
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path: str, progress: Callable[[int, int], None] | None = None) -> int:
+    if progress is None:
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha512")
+        return int.from_bytes(digest.digest(), "big")
+
+    digest = hashlib.sha512()
+    total = os.path.getsize(path)
+    done = 0
     with open(path, "rb") as f:
-        digest = hashlib.file_digest(f, "sha512")
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            done += len(chunk)
+            progress(done, total)
     return int.from_bytes(digest.digest(), "big")
 
 
-def sign_file(file_path: str, signature_path: str, n: int, d: int) -> None:
-    file_hash = hash_file(file_path)
+def sign_file(file_path: str, signature_path: str, n: int, d: int | PrivateKey,
+              progress: Callable[[int, int], None] | None = None) -> None:
+    key = d if isinstance(d, PrivateKey) else PrivateKey(d, n)
+    file_hash = hash_file(file_path, progress)
     if file_hash >= n:
         raise ValueError("Хэш больше модуля n (увеличьте размер ключа)")
 
-    sig_int = pow(file_hash, d, n)
+    sig_int = private_power(file_hash, key)
     sig_bytes = sig_int.to_bytes(math.ceil(sig_int.bit_length() / 8), "big")
     sig_b64 = base64.b64encode(sig_bytes).decode("ascii")
     with open(signature_path, "w", encoding="utf-8") as f:
         f.write(sig_b64)
 
 
-def verify_file(file_path: str, signature_path: str, n: int, e: int) -> bool:
-    file_hash = hash_file(file_path)
+def verify_file(file_path: str, signature_path: str, n: int, e: int,
+                progress: Callable[[int, int], None] | None = None) -> bool:
+    file_hash = hash_file(file_path, progress)
     if file_hash >= n:
         return False
 